@@ -0,0 +1,88 @@
+import argparse
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from DataStructures.BinaryTree import TreeNode
+from Entities.Agent import Agent
+from Entities.Appointment import Appointment
+from Entities.Bid import Bid
+from Services.DataGenerator import generate_properties, generate_clients
+from REMS import RealEstateSystem
+
+
+def bytes_per_entity(make, count):
+    # Retained bytes of the `count` objects yielded by make(count), divided by count
+    gc.collect()
+    tracemalloc.start()
+    objects = list(make(count))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Leave out the list holding the objects
+    return (current - sys.getsizeof(objects)) / count
+
+
+def per_operation(operation, count):
+    # Retained bytes and net allocated blocks per call of operation(i), plus the largest transient footprint
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    blocks = sys.getallocatedblocks()
+    for i in range(count):
+        operation(i)
+    net_blocks = sys.getallocatedblocks() - blocks
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - base) / count, peak - base, net_blocks / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report bytes per entity and allocations per RealEstateSystem operation")
+    parser.add_argument("--size", type=int, default=50000, help="number of entities per measurement")
+    parser.add_argument("--operations", type=int, default=1000, help="number of calls per measured workflow")
+    args = parser.parse_args()
+    size = args.size
+
+    # Generated first, so the generator's cached name and address pools are not counted against the entities below
+    properties = list(generate_properties(size))
+    clients = list(generate_clients(size))
+    now = datetime(2025, 1, 1)
+    entities = {
+        "Property": generate_properties,
+        "Client": generate_clients,
+        "Agent": lambda count: (Agent(i, f"Agent {i}", []) for i in range(count)),
+        "Appointment": lambda count: (Appointment(i, i, i, i, now) for i in range(count)),
+        "Bid": lambda count: (Bid(i, i, i, 100000.0 + i) for i in range(count)),
+        "TreeNode": lambda count: (TreeNode(None, i) for i in range(count)),
+    }
+    print(f"{'entity':<14}{'bytes/entity':>14}")
+    for name, factory in entities.items():
+        print(f"{name:<14}{bytes_per_entity(factory, size):>14.0f}")
+
+    system = RealEstateSystem()
+    system.setProperty(properties)
+    for client in clients:
+        system.addClient(client)
+    extra = list(generate_properties(args.operations, seed=1, start_id=size + 1))
+
+    workflows = {
+        "addProperty": lambda i: system.addProperty(extra[i]),
+        "getProperty": lambda i: system.getProperty(i + 1),
+        "getClient": lambda i: system.getClient(i + 1),
+        "getNearestNProperties(10)": lambda i: system.getNearestNProperties(i + 1, 10),
+        "filterProperties": lambda i: system.filterProperties(clients[i]),
+        "scheduleAppointment": lambda i: system.scheduleAppointment(
+            Appointment(i, i, i, i, now + timedelta(hours=i))),
+        "placeBid": lambda i: system.placeBid(Bid(i, i, i % size + 1, 100000.0 + i)),
+        "deleteProperty": lambda i: system.deleteProperty(size + 1 + i),
+    }
+    print()
+    print(f"{'operation':<28}{'retained B/op':>15}{'peak B':>12}{'net blocks/op':>15}")
+    for name, operation in workflows.items():
+        retained, peak, blocks = per_operation(operation, args.operations)
+        print(f"{name:<28}{retained:>15.0f}{peak:>12.0f}{blocks:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+from Benchmarks.Timing import percentile
+from Entities.Agent import Agent
+from Entities.Appointment import Appointment
+from Entities.Bid import Bid
+from Services.DataGenerator import generate_properties, generate_clients, generate_agents
+from Services.Instrumentation import PERCENTILES
+from REMS import RealEstateSystem
+
+START = datetime(2030, 1, 1)
+
+
+class Case:
+    # One timed operation. calls(run) builds the argument-bound calls for a run outside the timed region and
+    # reset(run) undoes their effects afterwards, so every run starts from the same system
+    def __init__(self, name, calls, reset=None):
+        self.name = name
+        self.calls = calls
+        self.reset = reset
+
+
+def build_system(size):
+    # size properties and clients and size // 10 agents, each with ten properties as in Agent.create_random_agents
+    system = RealEstateSystem()
+    system.setProperty(generate_properties(size))
+    system.setClients(generate_clients(size))
+    for agent in generate_agents(max(size // 10, 1)):
+        system.addAgent(agent)
+    return system
+
+
+def build_cases(system, size, ops):
+    properties = list(generate_properties(ops, seed=1, start_id=size + 1))
+    clients = list(generate_clients(ops, seed=1, start_id=size + 1))
+    existing_properties = [system.getProperty(property_id) for property_id in range(1, ops + 1)]
+    existing_clients = [system.getClient(client_id) for client_id in range(1, ops + 1)]
+    queries = [system.getClient(client_id) for client_id in range(1, size + 1, max(size // ops, 1))][:ops]
+    ids = lambda run: [(run * ops + i) % size + 1 for i in range(ops)]
+
+    def appointments(run):
+        # Distinct agents, properties and hours, so no appointment conflicts with another
+        base = size + run * ops
+        return [Appointment(base + i, i, base + i, base + i, START + timedelta(hours=run * ops + i)) for i in range(ops)]
+
+    def bids(run):
+        base = size + run * ops
+        return [Bid(base + i, i % size + 1, i % size + 1, 100000.0 + base + i) for i in range(ops)]
+
+    return [
+        Case("property.insert", lambda run: [lambda p=p: system.addProperty(p) for p in properties],
+             lambda run: [system.deleteProperty(p.property_id) for p in properties]),
+        Case("property.find", lambda run: [lambda i=i: system.getProperty(i) for i in ids(run)]),
+        Case("property.delete", lambda run: [lambda p=p: system.deleteProperty(p.property_id) for p in existing_properties],
+             lambda run: [system.addProperty(p) for p in existing_properties]),
+        Case("client.insert", lambda run: [lambda c=c: system.addClient(c) for c in clients],
+             lambda run: [system.deleteClient(c.client_id) for c in clients]),
+        Case("client.find", lambda run: [lambda i=i: system.getClient(i) for i in ids(run)]),
+        Case("client.delete", lambda run: [lambda c=c: system.deleteClient(c.client_id) for c in existing_clients],
+             lambda run: [system.addClient(c) for c in existing_clients]),
+        Case("agent.insert", lambda run: [lambda a=a: system.addAgent(a) for a in
+                                          (Agent(size + run * ops + i, f"Agent {i}", []) for i in range(ops))]),
+        Case("agent.find", lambda run: [lambda i=i: system.getAgent(i) for i in ids(run)]),
+        Case("nearest(10)", lambda run: [lambda i=i: system.getNearestNProperties(i, 10) for i in ids(run)]),
+        Case("filter", lambda run: [lambda c=c: system.filterProperties(c) for c in queries]),
+        Case("recommend(10)", lambda run: [lambda c=c: system.recommendProperties(c, 10) for c in queries]),
+        Case("schedule", lambda run: [lambda a=a: system.scheduleAppointment(a) for a in appointments(run)],
+             lambda run: [system.cancelAppointment(a.appointment_id) for a in appointments(run)]),
+        Case("bid", lambda run: [lambda b=b: system.placeBid(b) for b in bids(run)],
+             lambda run: [system.withdrawBid(b.bid_id) for b in bids(run)]),
+    ]
+
+
+def measure(case, warmup, repeat):
+    # Time every call on its own, so the percentiles describe single operations rather than whole runs
+    samples = []
+    throughputs = []
+    perf_counter_ns = time.perf_counter_ns
+    for run in range(warmup + repeat):
+        calls = case.calls(run)
+        latencies = []
+        gc.collect()
+        started = perf_counter_ns()
+        for call in calls:
+            start = perf_counter_ns()
+            call()
+            latencies.append(perf_counter_ns() - start)
+        elapsed = perf_counter_ns() - started
+        if case.reset is not None:
+            case.reset(run)
+        if run >= warmup:
+            samples.extend(latencies)
+            throughputs.append(len(calls) / elapsed * 1e9)
+    samples.sort()
+    result = {f"p{q}_us": percentile(samples, q) / 1000 for q in PERCENTILES}
+    result["mean_us"] = sum(samples) / len(samples) / 1000
+    result["ops_per_s"] = sorted(throughputs)[len(throughputs) // 2]
+    return result
+
+
+def compare(results, baseline, metric, tolerance):
+    # (operation, size, baseline, current) for every measurement slower than baseline by more than tolerance
+    regressions = []
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            previous = baseline.get(name, {}).get(size)
+            if previous is not None and result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append((name, size, previous[metric], result[metric]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each RealEstateSystem operation at several sizes, "
+                                                 "with warmup, repeats and per-operation percentiles")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--ops", type=int, default=1000, help="calls timed per run")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before measuring")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per operation")
+    parser.add_argument("--only", nargs="+", help="operations to run, by name")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--metric", default="p50_us", choices=[f"p{q}_us" for q in PERCENTILES] + ["mean_us"])
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown over the baseline, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'operation':<18}{'size':>10}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'ops/s':>12}")
+    for size in args.sizes:
+        system = build_system(size)
+        for case in build_cases(system, size, min(args.ops, size)):
+            if args.only and case.name not in args.only:
+                continue
+            result = measure(case, args.warmup, args.repeat)
+            results.setdefault(case.name, {})[str(size)] = result
+            print(f"{case.name:<18}{size:>10}{result['p50_us']:>10.1f}{result['p95_us']:>10.1f}"
+                  f"{result['p99_us']:>10.1f}{result['ops_per_s']:>12,.0f}")
+        del system
+
+    if args.output:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {"ops": args.ops, "warmup": args.warmup, "repeat": args.repeat},
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.metric, args.tolerance)
+        for name, size, previous, current in regressions:
+            print(f"REGRESSION {name} at {size}: {args.metric} {previous:.1f} -> {current:.1f} "
+                  f"(+{current / previous - 1:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions past {args.tolerance:.0%} of the baseline {args.metric}")
+
+
+if __name__ == "__main__":
+    main()
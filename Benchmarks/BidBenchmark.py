@@ -0,0 +1,34 @@
+import argparse
+import random
+from Benchmarks.Timing import timed
+from Entities.Bid import Bid
+from REMS import RealEstateSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-property bid order book")
+    parser.add_argument("--bids", type=int, default=1000000, help="number of bids to place")
+    parser.add_argument("--properties", type=int, default=100000, help="number of properties bid on")
+    parser.add_argument("--clients", type=int, default=100000, help="number of bidding clients")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    bids = [Bid(bid_id, rng.randrange(args.clients), rng.randrange(args.properties),
+                round(rng.uniform(100000, 1000000), 2)) for bid_id in range(args.bids)]
+    system = RealEstateSystem()
+    queries = [rng.randrange(args.properties) for _ in range(100000)]
+    withdrawn = rng.sample(range(args.bids), args.bids // 10)
+    clients = [rng.randrange(args.clients) for _ in range(100000)]
+
+    print(f"{'operation':<28}{'count':>10}{'total':>11}{'per op':>15}")
+    timed("placeBid", len(bids), lambda: [system.placeBid(bid) for bid in bids])
+    timed("getHighestBid", len(queries), lambda: [system.getHighestBid(p) for p in queries])
+    timed("getTopBids(10)", len(queries), lambda: [system.getTopBids(p, 10) for p in queries])
+    timed("withdrawBid", len(withdrawn), lambda: [system.withdrawBid(bid_id) for bid_id in withdrawn])
+    timed("getHighestBid after withdraw", len(queries), lambda: [system.getHighestBid(p) for p in queries])
+    timed("getClientBids", len(clients), lambda: [system.getClientBids(c) for c in clients])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import random
+import time
+from Benchmarks.Timing import percentile
+from Entities.Bid import Bid
+from REMS import RealEstateSystem
+
+
+class PropertyRef:
+    # Just enough of a Property for startRealTimeBidding
+    __slots__ = ('property_id',)
+
+    def __init__(self, property_id):
+        self.property_id = property_id
+
+
+async def run(args):
+    system = RealEstateSystem()
+    for property_id in range(args.properties):
+        engine = system.startRealTimeBidding(PropertyRef(property_id))
+    engine.queue_size = args.queue_size
+
+    rng = random.Random(args.seed)
+    latencies = []
+    bid_ids = iter(range(args.bidders * args.bids))
+    subscriptions = []
+    listeners = []
+
+    async def listen(subscription):
+        # Drain notifications and record how long each one waited
+        while True:
+            notification = await subscription.get()
+            latencies.append(time.perf_counter() - notification.created)
+
+    async def bidder(client):
+        property_id = rng.randrange(args.properties)
+        subscription = engine.subscribe(client, property_id)
+        subscriptions.append(subscription)
+        listeners.append(asyncio.create_task(listen(subscription)))
+        amount = 100000.0
+        accepted = 0
+        for _ in range(args.bids):
+            amount += rng.uniform(100, 5000)
+            accepted += await engine.submit(Bid(next(bid_ids), client, property_id, round(amount, 2)))
+        return accepted
+
+    start = time.perf_counter()
+    accepted = sum(await asyncio.gather(*(bidder(client) for client in range(args.bidders))))
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0.1)  # Let listeners drain what is still queued
+    for listener in listeners:
+        listener.cancel()
+    await asyncio.gather(*listeners, return_exceptions=True)
+    await engine.close()
+
+    latencies.sort()
+    submitted = args.bidders * args.bids
+    print(f"bidders={args.bidders} properties={args.properties} bids={submitted}")
+    print(f"throughput      {submitted / elapsed:,.0f} bids/s")
+    print(f"accepted        {accepted:,} (rejected {engine.rejected:,})")
+    print(f"notifications   {len(latencies):,} delivered, {sum(s.dropped for s in subscriptions):,} dropped")
+    print(f"latency p50     {percentile(latencies, 50) * 1000:.3f} ms")
+    print(f"latency p99     {percentile(latencies, 99) * 1000:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the asyncio real-time bidding engine")
+    parser.add_argument("--bidders", type=int, default=5000, help="number of simulated bidders")
+    parser.add_argument("--properties", type=int, default=500, help="number of properties open for bidding")
+    parser.add_argument("--bids", type=int, default=20, help="bids submitted by each bidder")
+    parser.add_argument("--queue-size", type=int, default=100, help="bounded notification queue per subscriber")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import threading
+import time
+from Services.DataGenerator import generate_properties, generate_clients
+from REMS import RealEstateSystem
+
+
+def run(system, readers, reads, writer_properties):
+    # Reads per second across `readers` threads, with one writer thread adding listings meanwhile if given any
+    clients = [system.getClient(client_id) for client_id in range(1, 101)]
+    size = len(system.properties)
+
+    def reader(index):
+        for i in range(reads):
+            property_id = (index * 7919 + i * 31) % size + 1
+            if i % 3 == 0:
+                system.getNearestNProperties(property_id, 10)
+            elif i % 3 == 1:
+                system.filterProperties(clients[i % 100])
+            else:
+                system.getProperty(property_id)
+
+    def writer():
+        for property in writer_properties:
+            system.addProperty(property)
+        for property in writer_properties:
+            system.deleteProperty(property.property_id)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    if writer_properties:
+        threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return readers * reads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure read throughput of a thread-safe system as reader threads grow")
+    parser.add_argument("--size", type=int, default=100000, help="number of properties")
+    parser.add_argument("--reads", type=int, default=300, help="reads per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--writes", type=int, default=2000, help="listings added and removed by the writer thread")
+    args = parser.parse_args()
+
+    plain = RealEstateSystem()
+    locked = RealEstateSystem(thread_safe=True)
+    for system in (plain, locked):
+        system.setProperty(generate_properties(args.size))
+        system.setClients(generate_clients(100))
+    extra = list(generate_properties(args.writes, seed=1, start_id=args.size + 1))
+
+    print(f"{'threads':>8}{'unlocked reads/s':>18}{'locked reads/s':>16}{'locked + writer':>17}")
+    for readers in args.threads:
+        print(f"{readers:>8}{run(plain, readers, args.reads, []):>18,.0f}{run(locked, readers, args.reads, []):>16,.0f}"
+              f"{run(locked, readers, args.reads, extra):>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import argparse
+import os
+from collections import deque
+from Benchmarks.Timing import elapsed
+from Entities.Client import Client
+from Entities.Property import Property
+from Services.DataGenerator import generate_properties, generate_clients
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-row Faker fixtures with the seeded batch generator")
+    parser.add_argument("--size", type=int, default=1000000, help="number of rows for the batch generator")
+    parser.add_argument("--faker-size", type=int, default=10000, help="number of rows for the per-row Faker path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    runs = [
+        ("Faker properties", args.faker_size, Property.create_random_properties),
+        ("Faker clients", args.faker_size, Client.create_random_clients),
+        ("generated properties", args.size, generate_properties),
+        ("generated clients", args.size, generate_clients),
+        (f"generated properties x{args.workers}", args.size,
+         lambda count: generate_properties(count, workers=args.workers)),
+    ]
+    print(f"{'generator':<28}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    for name, count, make in runs:
+        seconds = elapsed(lambda: deque(make(count), maxlen=0))
+        print(f"{name:<28}{count:>10}{seconds:>10.2f}{count / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import argparse
+import os
+import tempfile
+from Services.DataGenerator import generate_properties
+from Services.FeedIngestion import write_feed
+from REMS import RealEstateSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure streaming ingestion of JSONL and CSV property feeds")
+    parser.add_argument("--size", type=int, default=200000, help="number of rows in each feed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parser processes for the pooled run")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'feed':<8}{'layout':<13}{'workers':>8}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+        for feed_format in ("jsonl", "csv"):
+            path = os.path.join(directory, f"properties.{feed_format}")
+            write_feed(path, generate_properties(args.size))
+            for name, compact in (("object-tree", False), ("columnar", True)):
+                for workers in (0, args.workers):
+                    system = RealEstateSystem(compact=compact)
+                    stats = system.ingestFeed(path, batch_size=args.batch_size, workers=workers)
+                    print(f"{feed_format:<8}{name:<13}{workers:>8}{stats.rows:>10}{stats.elapsed:>10.2f}"
+                          f"{stats.rows_per_second:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from Services.DataGenerator import generate_properties
+from REMS import RealEstateSystem
+
+
+def measure(count, compact):
+    # Bytes retained by a RealEstateSystem holding `count` properties, and the time to load them
+    next(generate_properties(1))  # Builds the generator's cached name and address pools outside the trace
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    system = RealEstateSystem(compact=compact)
+    for property in generate_properties(count):
+        system.addProperty(property)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory of the object-tree and columnar property layouts")
+    parser.add_argument("--size", type=int, default=100000, help="number of properties to load")
+    args = parser.parse_args()
+
+    print(f"{'layout':<12}{'retained MB':>14}{'peak MB':>12}{'bytes/property':>16}{'load s':>10}")
+    for name, compact in (("object-tree", False), ("columnar", True)):
+        current, peak, elapsed = measure(args.size, compact)
+        print(f"{name:<12}{current / 2**20:>14.1f}{peak / 2**20:>12.1f}{current / args.size:>16.0f}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import os
+import tempfile
+import time
+from Services.DataGenerator import generate_properties
+from REMS import RealEstateSystem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time saving and loading a binary snapshot of the system")
+    parser.add_argument("--size", type=int, default=1000000, help="number of properties in the snapshot")
+    args = parser.parse_args()
+
+    system = RealEstateSystem(compact=True)
+    system.setProperty(generate_properties(args.size))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "system.snapshot")
+        start = time.perf_counter()
+        system.saveSnapshot(path)
+        elapsed = time.perf_counter() - start
+        print(f"save {args.size} properties: {elapsed:.2f}s, {os.path.getsize(path) / 2**20:.1f} MB")
+
+        print(f"{'layout':<12}{'load s':>10}{'properties/s':>16}")
+        for name, compact in (("columnar", True), ("object-tree", False)):
+            start = time.perf_counter()
+            loaded = RealEstateSystem.loadSnapshot(path, compact=compact)
+            elapsed = time.perf_counter() - start
+            assert len(loaded.properties) == args.size
+            print(f"{name:<12}{elapsed:>10.2f}{args.size / elapsed:>16.0f}")
+            del loaded
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import time
+
+
+def elapsed(operation):
+    # Wall-clock seconds taken by operation()
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def timed(label, count, operation):
+    # Run operation() once, covering count calls, and print its total and per-call time
+    seconds = elapsed(operation)
+    print(f"{label:<28}{count:>10}{seconds:>10.2f}s{seconds / count * 1e6:>12.2f} us/op")
+    return seconds
+
+
+def percentile(ordered, q):
+    # Nearest-rank q-th percentile of an ascending list, 0.0 for an empty one
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, -(-q * len(ordered) // 100) - 1))]
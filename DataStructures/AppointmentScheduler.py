@@ -0,0 +1,167 @@
+import heapq
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Parses each distinct ISO date string once; bulk bookings tend to repeat the same few dates
+_parse = lru_cache(maxsize=4096)(datetime.fromisoformat)
+
+
+class AppointmentScheduler:
+    # Every pending appointment has one (start, sequence, appointment) entry, shared by the heap, the id map and
+    # both calendars, so scheduling allocates a single tuple. Slots all last `duration`, so a booking ends at
+    # start + duration
+    def __init__(self, duration=timedelta(hours=1)):
+        self.duration = duration  # Length of every appointment slot
+        self.heap = []  # Min-heap of entries for dispatch in time order
+        self.appointments = {}  # appointment_id -> entry of the pending appointment
+        # agent -> sorted list of entries; an owner with a single booking maps to the bare entry, so the common
+        # one-booking calendar costs no list and no insort
+        self.agent_calendars = {}
+        self.property_calendars = {}  # property_id -> the same, per property
+        self.sequence = 0  # Tie-breaker so equal start times dispatch in insertion order
+        self.stale = 0  # Heap entries left behind by cancellations
+
+    def _conflict(self, calendar, start, end):
+        # Booking in the calendar overlapping [start, end), or None; bookings never overlap so only neighbours matter
+        if type(calendar) is tuple:
+            return calendar if calendar[0] < end and calendar[0] + self.duration > start else None
+        index = bisect_left(calendar, (start,))
+        if index > 0 and calendar[index - 1][0] + self.duration > start:
+            return calendar[index - 1]
+        if index < len(calendar) and calendar[index][0] < end:
+            return calendar[index]
+        return None
+
+    def _book(self, calendars, owner, calendar, entry):
+        # Second and later bookings of an owner; the first is stored bare by schedule
+        if type(calendar) is tuple:
+            calendars[owner] = [calendar, entry] if calendar < entry else [entry, calendar]
+        else:
+            insort(calendar, entry)
+
+    def _unbook(self, calendars, owner, entry):
+        calendar = calendars.get(owner)
+        if calendar is None:
+            return
+        if type(calendar) is tuple:
+            if calendar is entry:
+                del calendars[owner]
+            return
+        index = bisect_left(calendar, entry)
+        if index < len(calendar) and calendar[index] is entry:
+            del calendar[index]
+        if len(calendar) == 1:
+            calendars[owner] = calendar[0]
+        elif not calendar:
+            del calendars[owner]
+
+    def schedule(self, appointment):
+        appointment_id = appointment.appointment_id
+        appointments = self.appointments
+        if appointment_id in appointments:
+            raise ValueError(f"Appointment {appointment_id} is already scheduled")
+        start = appointment.date_time
+        if start.__class__ is str:
+            start = _parse(start)
+        end = start + self.duration
+        agent = appointment.agent
+        property_id = appointment.property_id
+        agent_calendars = self.agent_calendars
+        property_calendars = self.property_calendars
+
+        agent_calendar = agent_calendars.get(agent)
+        if agent_calendar is not None:
+            conflict = self._conflict(agent_calendar, start, end)
+            if conflict is not None:
+                raise ValueError(f"Agent {agent} is already booked at {conflict[0]} "
+                                 f"(appointment {conflict[2].appointment_id})")
+        property_calendar = property_calendars.get(property_id)
+        if property_calendar is not None:
+            conflict = self._conflict(property_calendar, start, end)
+            if conflict is not None:
+                raise ValueError(f"Property {property_id} is already booked at {conflict[0]} "
+                                 f"(appointment {conflict[2].appointment_id})")
+
+        sequence = self.sequence = self.sequence + 1
+        entry = (start, sequence, appointment)
+        if agent_calendar is None:
+            agent_calendars[agent] = entry
+        else:
+            self._book(agent_calendars, agent, agent_calendar, entry)
+        if property_calendar is None:
+            property_calendars[property_id] = entry
+        else:
+            self._book(property_calendars, property_id, property_calendar, entry)
+        appointments[appointment_id] = entry
+        heapq.heappush(self.heap, entry)
+
+    def _release(self, appointment_id):
+        entry = self.appointments.pop(appointment_id, None)
+        if entry is None:
+            raise KeyError(f"Appointment {appointment_id} is not scheduled")
+        appointment = entry[2]
+        self._unbook(self.agent_calendars, appointment.agent, entry)
+        self._unbook(self.property_calendars, appointment.property_id, entry)
+        return appointment
+
+    def _pending(self, entry):
+        return self.appointments.get(entry[2].appointment_id) is entry
+
+    def cancel(self, appointment_id):
+        appointment = self._release(appointment_id)
+        # The heap entry is skipped lazily when it reaches the top, or dropped when stale entries dominate
+        self.stale += 1
+        if self.stale > len(self.heap) // 2:
+            self.heap = [entry for entry in self.heap if self._pending(entry)]
+            heapq.heapify(self.heap)
+            self.stale = 0
+        return appointment
+
+    def _discard_cancelled(self):
+        heap = self.heap
+        while heap and not self._pending(heap[0]):
+            heapq.heappop(heap)
+            self.stale -= 1
+
+    def peek_next(self):
+        self._discard_cancelled()
+        if not self.heap:
+            raise IndexError("No appointments scheduled")
+        return self.heap[0][2]
+
+    def pop_next(self):
+        # Remove and return the earliest pending appointment
+        self._discard_cancelled()
+        if not self.heap:
+            raise IndexError("No appointments scheduled")
+        return self._release(heapq.heappop(self.heap)[2].appointment_id)
+
+    def next_free_slot(self, agent, after, duration=None):
+        # Earliest start >= after at which the agent is free for the whole duration
+        if isinstance(after, str):
+            after = _parse(after)
+        duration = duration or self.duration
+        calendar = self._bookings(self.agent_calendars, agent)
+        start = after
+        index = bisect_left(calendar, (start,))
+        if index > 0 and calendar[index - 1][0] + self.duration > start:
+            start = calendar[index - 1][0] + self.duration
+        while index < len(calendar) and calendar[index][0] < start + duration:
+            start = max(start, calendar[index][0] + self.duration)
+            index += 1
+        return start
+
+    def _bookings(self, calendars, owner):
+        calendar = calendars.get(owner, [])
+        return [calendar] if type(calendar) is tuple else calendar
+
+    def agent_schedule(self, agent):
+        return [entry[2] for entry in self._bookings(self.agent_calendars, agent)]
+
+    def __len__(self):
+        return len(self.appointments)
+
+    def __iter__(self):
+        # Pending appointments in the order they were scheduled
+        return (entry[2] for entry in self.appointments.values())
@@ -1,90 +1,216 @@
+from operator import attrgetter
+
+
 class TreeNode:
-    def __init__(self, value):
+    __slots__ = ('value', 'key', 'left', 'right', 'height')
+
+    def __init__(self, value, key):
         self.value = value  # The object stored in the node
+        self.key = key  # Cached sorting key of the object
         self.left = None  # Left child
         self.right = None  # Right child
         self.height = 1  # Height of node (for balancing)
 
 class BinaryTree:
+    node_type = TreeNode  # Node class, overridden by trees that keep extra data per node
+
     def __init__(self, sortable_property):
         self.root = None  # Root node of the tree
-        self.sortable_property = sortable_property  # The key used for sorting the objects
-    
-    def _get_key(self, obj):
-        return getattr(obj, self.sortable_property)  # Retrieve the sorting key from the object
-    
+        self.sortable_property = sortable_property  # The key used for sorting the objects, or a tuple of keys
+        if isinstance(sortable_property, str):
+            self._get_key = attrgetter(sortable_property)  # Retrieve the sorting key from the object
+        else:
+            self._get_key = attrgetter(*sortable_property)  # Composite key, e.g. ('price', 'property_id')
+        self.count = 0  # Number of objects in the tree
+        self.inserts = 0  # Single-object inserts, the denominator of rotations per insert
+        self.rotations = 0  # Rotations done while rebalancing
+
     def insert(self, obj):
-        if not hasattr(obj, self.sortable_property):
-            raise ValueError(f"Object must have a '{self.sortable_property}' attribute")
-        self.root = self._insert_recursive(self.root, obj)
-    
-    def _insert_recursive(self, node, obj):
-        if node is None:
-            return TreeNode(obj)
-        
-        key = self._get_key(obj)
-        if key < self._get_key(node.value):
-            node.left = self._insert_recursive(node.left, obj)
+        try:
+            key = self._get_key(obj)
+        except AttributeError:
+            raise ValueError(f"Object must have a '{self.sortable_property}' attribute") from None
+
+        new_node = self.node_type(obj, key)
+        self.count += 1
+        self.inserts += 1
+        if self.root is None:
+            self.root = new_node
+            return
+
+        # Walk down to the insertion point, remembering the path for rebalancing
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
         else:
-            node.right = self._insert_recursive(node.right, obj)
-        
-        # Update height and balance the node
-        return self._balance(node)
-    
+            parent.right = new_node
+        self._rebalance_path(path)
+
     def delete(self, key):
-        self.root = self._delete_recursive(self.root, key)
-    
-    def _delete_recursive(self, node, key):
+        path = []
+        node = self.root
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+
         if node is None:
-            return None
-        
-        if key < self._get_key(node.value):
-            node.left = self._delete_recursive(node.left, key)
-        elif key > self._get_key(node.value):
-            node.right = self._delete_recursive(node.right, key)
+            return False
+        self.count -= 1
+
+        if node.left is not None and node.right is not None:
+            # Node has two children, move the inorder successor into it and unlink the successor instead
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.value = successor.value
+            node.key = successor.key
+            node = successor
+
+        child = node.left if node.left is not None else node.right
+        if path:
+            parent = path[-1]
+            if parent.left is node:
+                parent.left = child
+            else:
+                parent.right = child
         else:
-            # Node to delete found
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
+            self.root = child
+        self._rebalance_path(path)
+        return True
+
+    def _sorted_entries(self, objects):
+        # Sort objects by key (linear when already sorted) and pair each with its key
+        try:
+            objects = sorted(objects, key=self._get_key)
+        except AttributeError:
+            raise ValueError(f"Object must have a '{self.sortable_property}' attribute") from None
+        return list(map(self._get_key, objects)), objects
+
+    def _build_balanced(self, keys, objects):
+        # Build a perfectly balanced tree from sorted keys/objects in linear time
+        if not objects:
+            return None
+        root = None
+        stack = [(0, len(objects), None, False)]
+        while stack:
+            low, high, parent, is_left = stack.pop()
+            mid = (low + high) // 2
+            node = self.node_type(objects[mid], keys[mid])
+            node.height = (high - low).bit_length()  # Height of a balanced subtree holding high - low nodes
+            if parent is None:
+                root = node
+            elif is_left:
+                parent.left = node
             else:
-                # Node has two children, find the inorder successor
-                successor = self._find_min_node(node.right)
-                node.value = successor.value
-                node.right = self._delete_recursive(node.right, self._get_key(successor.value))
-        
-        # Update height and balance the node
-        return self._balance(node)
+                parent.right = node
+            if low < mid:
+                stack.append((low, mid, node, True))
+            if mid + 1 < high:
+                stack.append((mid + 1, high, node, False))
+        return root
+
+    def bulk_load(self, objects):
+        # Replace the contents of the tree with the given objects
+        keys, objects = self._sorted_entries(objects)
+        self.root = self._build_balanced(keys, objects)
+        self.count = len(objects)
+
+    def insert_many(self, objects):
+        keys, objects = self._sorted_entries(objects)
+        if not objects:
+            return
+        if self.root is None:
+            self.root = self._build_balanced(keys, objects)
+            self.count = len(objects)
+            return
+
+        # A small batch is cheaper to insert one at a time than to rebuild the whole tree
+        if len(objects) * self.count.bit_length() < self.count:
+            for obj in objects:
+                self.insert(obj)
+            return
+
+        # Merge the sorted batch with the in-order contents and rebuild in O(n + m)
+        merged_keys = []
+        merged_objects = []
+        i = 0
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            while i < len(objects) and keys[i] < node.key:
+                merged_keys.append(keys[i])
+                merged_objects.append(objects[i])
+                i += 1
+            merged_keys.append(node.key)
+            merged_objects.append(node.value)
+            node = node.right
+        merged_keys.extend(keys[i:])
+        merged_objects.extend(objects[i:])
+
+        self.root = self._build_balanced(merged_keys, merged_objects)
+        self.count = len(merged_objects)
+
+    def _rebalance_path(self, path):
+        # Update heights and rotate bottom-up along the path, stopping once a subtree height is unchanged
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            balanced = self._balance(node)
+            if balanced is not node:
+                if i == 0:
+                    self.root = balanced
+                else:
+                    parent = path[i - 1]
+                    if parent.left is node:
+                        parent.left = balanced
+                    else:
+                        parent.right = balanced
+            if balanced.height == old_height:
+                break
 
 
     def _get_height(self, node):
         return node.height if node else 0
-    
+
     def _get_balance_factor(self, node):
         return self._get_height(node.left) - self._get_height(node.right) if node else 0
-    
+
     def _balance(self, node):
         # Update height
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
-        
+        left_height = node.left.height if node.left else 0
+        right_height = node.right.height if node.right else 0
+        node.height = 1 + (left_height if left_height > right_height else right_height)
+
         # Get balance factor
-        balance = self._get_balance_factor(node)
-        
+        balance = left_height - right_height
+
         # Perform rotations if unbalanced
         if balance > 1:  # Left heavy
             if self._get_balance_factor(node.left) < 0:  # Left-Right case
                 node.left = self._rotate_left(node.left)
             return self._rotate_right(node)
-        
+
         if balance < -1:  # Right heavy
             if self._get_balance_factor(node.right) > 0:  # Right-Left case
                 node.right = self._rotate_right(node.right)
             return self._rotate_left(node)
-        
+
         return node
-    
+
     def _rotate_left(self, z):
+        self.rotations += 1
         y = z.right
         T2 = y.left
         y.left = z
@@ -92,8 +218,9 @@ class BinaryTree:
         z.height = 1 + max(self._get_height(z.left), self._get_height(z.right))
         y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
         return y
-    
+
     def _rotate_right(self, z):
+        self.rotations += 1
         y = z.left
         T3 = y.right
         y.right = z
@@ -101,31 +228,51 @@ class BinaryTree:
         z.height = 1 + max(self._get_height(z.left), self._get_height(z.right))
         y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
         return y
-    
+
     def find(self, key):
-        return self._find_recursive(self.root, key)
-    
-    def _find_recursive(self, node, key):
-        if node is None:
-            return None
-        if key == self._get_key(node.value):
-            return node.value
-        elif key < self._get_key(node.value):
-            return self._find_recursive(node.left, key)
-        else:
-            return self._find_recursive(node.right, key)
-    
-    def get_all_objects(self):
-        objects = []
-        self._inorder_collect_objects(self.root, objects)
-        return objects
-    
-    def _inorder_collect_objects(self, node, objects):
-        if node is not None:
-            self._inorder_collect_objects(node.left, objects)
-            objects.append(node.value)
-            self._inorder_collect_objects(node.right, objects)
+        node = self.root
+        while node is not None:
+            node_key = node.key
+            if key == node_key:
+                return node.value
+            node = node.left if key < node_key else node.right
+        return None
 
+    def __len__(self):
+        return self.count
 
+    def __iter__(self):
+        return self.range()
 
+    def range(self, low=None, high=None):
+        # Lazily yield the objects with low <= key <= high in key order (None leaves that end open)
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if low is not None and node.key < low:
+                    node = node.right  # The whole left subtree is below the range
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if high is not None and node.key > high:
+                return
+            yield node.value
+            node = node.right
 
+    def get_all_objects(self):
+        # In-order traversal with an explicit stack
+        objects = []
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            objects.append(node.value)
+            node = node.right
+        return objects
@@ -0,0 +1,74 @@
+from array import array
+from functools import lru_cache
+from Entities.Amenity import amenity_matcher
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, screening falls back to a Python loop
+    np = None
+
+
+@lru_cache(maxsize=1)
+def _popcounts():
+    # Popcount lookup table for vectorized "at least k" screens, built on first use
+    return np.array([bin(i).count('1') for i in range(1 << 16)], dtype=np.uint8)
+
+
+def mask_selection(masks, wanted, match='any', k=1):
+    # NumPy boolean array marking the masks of a non-empty 16-bit mask column that match `wanted`
+    common = np.frombuffer(masks, dtype=np.uint16) & wanted
+    if match == 'any':
+        return common != 0
+    if match == 'all':
+        return common == wanted
+    return _popcounts()[common] >= k
+
+
+def matching_rows(masks, wanted, match='any', k=1):
+    # Rows of a 16-bit mask column whose masks match `wanted` ('any', 'all' or 'at_least' k bits), in row order
+    if match not in ('any', 'all', 'at_least'):
+        raise ValueError(f"Unknown amenity match mode '{match}'")
+    if not masks:
+        return []
+
+    if np is not None:
+        return np.flatnonzero(mask_selection(masks, wanted, match, k)).tolist()
+
+    matches = amenity_matcher(match, wanted, k)
+    return [row for row, mask in enumerate(masks) if matches(mask)]
+
+
+class BitmaskColumn:
+    def __init__(self):
+        self.keys = []  # Key stored at each row
+        self.masks = array('H')  # Packed bitmask at each row (16 bits covers every Amenity)
+        self.rows = {}  # Key -> row
+
+    def add(self, key, mask):
+        row = self.rows.get(key)
+        if row is not None:
+            self.masks[row] = mask
+            return
+        self.rows[key] = len(self.keys)
+        self.keys.append(key)
+        self.masks.append(mask)
+
+    def remove(self, key):
+        row = self.rows.pop(key, None)
+        if row is None:
+            return
+        # Move the last row into the hole so the columns stay contiguous
+        last_key = self.keys.pop()
+        last_mask = self.masks.pop()
+        if row < len(self.keys):
+            self.keys[row] = last_key
+            self.masks[row] = last_mask
+            self.rows[last_key] = row
+
+    def __len__(self):
+        return len(self.keys)
+
+    def screen(self, wanted, match='any', k=1):
+        # Return the keys whose masks match `wanted` ('any', 'all' or 'at_least' k bits) in one pass
+        keys = self.keys
+        return [keys[row] for row in matching_rows(self.masks, wanted, match, k)]
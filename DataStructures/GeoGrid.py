@@ -0,0 +1,218 @@
+import heapq
+import math
+from .graph import EARTH_RADIUS_KM
+
+
+class GeoGrid:
+    def __init__(self, cell_size=0.01):
+        self.cell_size = cell_size  # Edge length of a grid cell in degrees
+        self.rows = int(math.ceil(180 / cell_size))  # Number of latitude bands
+        self.columns = int(math.ceil(360 / cell_size))  # Number of longitude bands (wraps around)
+        self.cells = {}  # (row, column) -> {id(obj): obj} for every non-empty cell
+        self.count = 0  # Number of stored objects
+        self.max_abs_latitude = 0.0  # Largest |latitude| ever stored, bounds longitude distances
+
+    def _cell(self, latitude, longitude):
+        row = min(int((latitude + 90) // self.cell_size), self.rows - 1)
+        column = int((longitude + 180) // self.cell_size) % self.columns
+        return row, column
+
+    def insert(self, obj):
+        # Returns the cell the object was filed under, for a later delete once its coordinates may have changed
+        cell = self._cell(obj.latitude, obj.longitude)
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = {}
+        bucket[id(obj)] = obj
+        self.count += 1
+        if abs(obj.latitude) > self.max_abs_latitude:
+            self.max_abs_latitude = abs(obj.latitude)
+        return cell
+
+    def delete(self, obj, cell=None):
+        if cell is None:
+            cell = self._cell(obj.latitude, obj.longitude)
+        bucket = self.cells.get(cell)
+        if bucket is None or id(obj) not in bucket:
+            return
+        del bucket[id(obj)]
+        self.count -= 1
+        if not bucket:
+            del self.cells[cell]  # Keep only occupied cells so sparse scans stay cheap
+
+    def __len__(self):
+        return self.count
+
+    def _ring_distance(self, cell, row, column):
+        # Chebyshev distance in cells, taking longitude wrap-around into account
+        dcol = abs(cell[1] - column)
+        return max(abs(cell[0] - row), min(dcol, self.columns - dcol))
+
+    def _rings(self, row, column):
+        # Yield (ring, occupied cells exactly `ring` cells away from (row, column)) in increasing ring order
+        cells = self.cells
+        ring = 0
+        while 2 * ring + 1 <= self.columns and (2 * ring + 1) ** 2 <= 4 * len(cells):
+            found = []
+            if ring == 0:
+                if (row, column) in cells:
+                    found.append((row, column))
+            else:
+                for r in (row - ring, row + ring):
+                    if 0 <= r < self.rows:
+                        for dc in range(-ring, ring + 1):
+                            cell = (r, (column + dc) % self.columns)
+                            if cell in cells:
+                                found.append(cell)
+                for r in range(max(row - ring + 1, 0), min(row + ring, self.rows)):
+                    for dc in (-ring, ring):
+                        cell = (r, (column + dc) % self.columns)
+                        if cell in cells:
+                            found.append(cell)
+            yield ring, found
+            ring += 1
+
+        # Scanning rings now costs more than the data holds, so order the remaining occupied cells directly
+        remaining = []
+        for cell in cells:
+            distance = self._ring_distance(cell, row, column)
+            if distance >= ring:
+                remaining.append((distance, cell))
+        remaining.sort()
+        index = 0
+        while index < len(remaining):
+            ring = remaining[index][0]
+            found = []
+            while index < len(remaining) and remaining[index][0] == ring:
+                found.append(remaining[index][1])
+                index += 1
+            yield ring, found
+
+    def _ring_bound(self, ring, latitude):
+        # Lower bound in km for any point that lies more than `ring` cells away
+        gap = math.radians(min(ring * self.cell_size, 180))
+        max_lat = math.radians(max(self.max_abs_latitude, abs(latitude)))
+        lat_bound = EARTH_RADIUS_KM * gap
+        lon_bound = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(max_lat) * math.sin(gap / 2)))
+        return min(lat_bound, lon_bound)
+
+    def nearest(self, latitude, longitude, n=10, exclude=None):
+        # Return the n objects closest to (latitude, longitude), nearest first, by expanding rings of cells
+        if n <= 0 or self.count == 0:
+            return []
+
+        row, column = self._cell(latitude, longitude)
+        lat1 = math.radians(latitude)
+        lon1 = math.radians(longitude)
+        cos_lat1 = math.cos(lat1)
+        radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+
+        heap = []  # Max-heap of the best n candidates as (-distance, sequence, obj)
+        sequence = 0
+        visited = 0
+        for ring, found in self._rings(row, column):
+            for cell in found:
+                for obj in self.cells[cell].values():
+                    visited += 1
+                    if obj is exclude:
+                        continue
+                    lat2 = radians(obj.latitude)
+                    a = sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos(lat2) * sin((radians(obj.longitude) - lon1) / 2) ** 2
+                    distance = 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+                    sequence += 1
+                    if len(heap) < n:
+                        heapq.heappush(heap, (-distance, sequence, obj))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, sequence, obj))
+
+            if visited >= self.count:
+                break
+            # Everything in the next ring is at least this far away, so the result cannot improve
+            if len(heap) == n and -heap[0][0] <= self._ring_bound(ring, latitude):
+                break
+
+        heap.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [entry[2] for entry in heap]
+
+    def _cells_in(self, row_low, row_high, column_low, column_high):
+        # Occupied cells inside a block of rows and a (possibly wrapping) span of columns
+        row_low = max(row_low, 0)
+        row_high = min(row_high, self.rows - 1)
+        if column_low <= column_high:
+            width = column_high - column_low + 1
+        else:
+            width = self.columns - column_low + column_high + 1
+        if row_high < row_low:
+            return
+
+        if (row_high - row_low + 1) * width > len(self.cells):
+            # The block is larger than the data, so filter the occupied cells instead
+            for cell in list(self.cells):
+                row, column = cell
+                if row_low <= row <= row_high and (column - column_low) % self.columns < width:
+                    yield cell
+            return
+
+        for row in range(row_low, row_high + 1):
+            for offset in range(width):
+                cell = (row, (column_low + offset) % self.columns)
+                if cell in self.cells:
+                    yield cell
+
+    def within_radius(self, latitude, longitude, radius_km):
+        # Lazily yield every object within radius_km of (latitude, longitude), visiting only candidate cells
+        if radius_km < 0 or self.count == 0:
+            return
+        angle = radius_km / EARTH_RADIUS_KM
+        lat = math.radians(latitude)
+        min_lat = math.degrees(lat - angle)
+        max_lat = math.degrees(lat + angle)
+        if min_lat <= -90 or max_lat >= 90 or angle >= math.pi / 2:
+            # The circle covers a pole, so every longitude is a candidate
+            min_lat = max(min_lat, -90)
+            max_lat = min(max_lat, 90)
+            column_low, column_high = 0, self.columns - 1
+        else:
+            dlon = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(lat))))
+            if 2 * dlon >= 360 - self.cell_size:
+                column_low, column_high = 0, self.columns - 1
+            else:
+                column_low = self._cell(latitude, longitude - dlon)[1]
+                column_high = self._cell(latitude, longitude + dlon)[1]
+        row_low = self._cell(min_lat, longitude)[0]
+        row_high = self._cell(max_lat, longitude)[0]
+
+        lat1 = lat
+        lon1 = math.radians(longitude)
+        cos_lat1 = math.cos(lat1)
+        radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+        for cell in self._cells_in(row_low, row_high, column_low, column_high):
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                continue
+            for obj in list(bucket.values()):
+                lat2 = radians(obj.latitude)
+                a = sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos(lat2) * sin((radians(obj.longitude) - lon1) / 2) ** 2
+                if 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a))) <= radius_km:
+                    yield obj
+
+    def within_bounds(self, min_latitude, min_longitude, max_latitude, max_longitude):
+        # Lazily yield every object inside the box; min_longitude > max_longitude crosses the antimeridian
+        if min_latitude > max_latitude or self.count == 0:
+            return
+        row_low = self._cell(min_latitude, min_longitude)[0]
+        row_high = self._cell(max_latitude, max_longitude)[0]
+        span = 360 if max_longitude - min_longitude >= 360 else (max_longitude - min_longitude) % 360
+        if span >= 360 - self.cell_size:
+            column_low, column_high = 0, self.columns - 1
+        else:
+            column_low = self._cell(min_latitude, min_longitude)[1]
+            column_high = self._cell(max_latitude, max_longitude)[1]
+
+        for cell in self._cells_in(row_low, row_high, column_low, column_high):
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                continue
+            for obj in list(bucket.values()):
+                if min_latitude <= obj.latitude <= max_latitude and (obj.longitude - min_longitude) % 360 <= span:
+                    yield obj
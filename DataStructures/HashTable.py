@@ -0,0 +1,126 @@
+_EMPTY = object()  # Marks a slot that has never been used
+_DELETED = object()  # Tombstone for a removed key, keeps probe chains intact
+
+
+class HashTable:
+    def __init__(self, key_property, initial_size=100):
+        self.key_property = key_property  # Property of the object to be used as key
+        self.size = 8  # Number of slots, always a power of two so the index is a bit mask
+        while self.size < initial_size:
+            self.size *= 2
+        self.count = 0  # Number of stored elements
+        self.tombstones = 0  # Number of deleted slots still in the table
+        self.load_factor = 0.7  # Threshold for resizing
+        self._resize_at = int(self.size * self.load_factor)  # Used slots (live + tombstones) that trigger a resize
+        self.resizes = 0  # Rehashes, whether they grew the table or only dropped tombstones
+        self.keys = [_EMPTY] * self.size  # Key stored in each slot
+        self.values = [None] * self.size  # Object stored in each slot
+
+    def _get_key(self, obj):
+        return getattr(obj, self.key_property)  # Retrieve key property from object
+
+    def _probe(self, key):
+        # Yield slot indexes for the key using the same perturbed probe sequence as CPython dicts
+        mask = self.size - 1
+        perturb = hash(key) & 0xFFFFFFFFFFFFFFFF
+        index = perturb & mask
+        while True:
+            yield index
+            perturb >>= 5
+            index = (5 * index + 1 + perturb) & mask
+
+    def _find_slot(self, key):
+        # Index of the slot holding key, or -1 (the probe loop is inlined since this is the hot path)
+        keys = self.keys
+        mask = self.size - 1
+        perturb = hash(key) & 0xFFFFFFFFFFFFFFFF
+        index = perturb & mask
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return -1
+            if slot_key is not _DELETED and slot_key == key:
+                return index
+            perturb >>= 5
+            index = (5 * index + 1 + perturb) & mask
+
+    def _resize(self):
+        # Double the table when it is mostly live entries, otherwise just rehash to drop tombstones
+        self._rehash(self.size * 2 if self.count * 2 >= self._resize_at else self.size)
+
+    def _rehash(self, size):
+        self.resizes += 1
+        old_keys = self.keys
+        old_values = self.values
+        self.size = size
+        self.keys = [_EMPTY] * self.size
+        self.values = [None] * self.size
+        self.tombstones = 0
+        self._resize_at = int(self.size * self.load_factor)
+
+        keys = self.keys
+        for key, obj in zip(old_keys, old_values):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            for index in self._probe(key):
+                if keys[index] is _EMPTY:
+                    keys[index] = key
+                    self.values[index] = obj
+                    break
+
+    def insert(self, obj):
+        key = self._get_key(obj)  # Extract key from object
+        keys = self.keys
+        reusable = -1  # First tombstone on the probe path, reused if the key is new
+        for index in self._probe(key):
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                break
+            if slot_key is _DELETED:
+                if reusable < 0:
+                    reusable = index
+            elif slot_key == key:
+                self.values[index] = obj  # Update existing key with new object
+                return
+
+        if reusable >= 0:
+            index = reusable
+            self.tombstones -= 1
+        keys[index] = key
+        self.values[index] = obj
+        self.count += 1  # Increase element count
+
+        # Resize once live entries plus tombstones pass the load factor
+        if self.count + self.tombstones > self._resize_at:
+            self._resize()
+
+    def insert_many(self, objects):
+        objects = list(objects)
+        # Grow once to fit the whole batch instead of doubling repeatedly along the way
+        needed = self.count + self.tombstones + len(objects)
+        if needed > self._resize_at:
+            size = self.size
+            while int(size * self.load_factor) < needed:
+                size *= 2
+            self._rehash(size)
+        for obj in objects:
+            self.insert(obj)
+
+    def find(self, key):
+        index = self._find_slot(key)
+        return self.values[index] if index >= 0 else None  # Return None if key is not found
+
+    def remove(self, key):
+        index = self._find_slot(key)
+        if index < 0:
+            raise KeyError(f"Key '{key}' not found")  # Raise error if key does not exist
+        self.keys[index] = _DELETED
+        self.values[index] = None
+        self.count -= 1  # Decrease element count
+        self.tombstones += 1
+
+    def __contains__(self, key):
+        return self._find_slot(key) >= 0
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,100 @@
+from .BinaryTree import BinaryTree, TreeNode
+
+
+class IntervalNode(TreeNode):
+    __slots__ = ('max_high',)
+
+    def __init__(self, value, key):
+        super().__init__(value, key)
+        self.max_high = key[1]  # Largest interval end in this subtree
+
+
+class IntervalTree(BinaryTree):
+    # AVL tree of objects keyed by (low, high, id) whose nodes track the largest high below them,
+    # so the intervals containing a point are found without visiting subtrees that end before it
+    node_type = IntervalNode
+
+    def __init__(self, low_property, high_property, id_property):
+        super().__init__((low_property, high_property, id_property))
+        self._refresh_all = False  # Set while deleting
+
+    def _update(self, node):
+        max_high = node.key[1]
+        if node.left is not None and node.left.max_high > max_high:
+            max_high = node.left.max_high
+        if node.right is not None and node.right.max_high > max_high:
+            max_high = node.right.max_high
+        node.max_high = max_high
+
+    def delete(self, key):
+        # Removing a node with two children moves its successor's key up the path, so no ancestor may be skipped
+        self._refresh_all = True
+        try:
+            return super().delete(key)
+        finally:
+            self._refresh_all = False
+
+    def _rebalance_path(self, path):
+        # Like BinaryTree, but also stop only once max_high is unchanged, since ancestors depend on it too
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            old_max_high = node.max_high
+            balanced = self._balance(node)
+            if balanced is not node:
+                if i == 0:
+                    self.root = balanced
+                else:
+                    parent = path[i - 1]
+                    if parent.left is node:
+                        parent.left = balanced
+                    else:
+                        parent.right = balanced
+            else:
+                self._update(node)  # Rotations update the nodes they move
+            if balanced.height == old_height and balanced.max_high == old_max_high and not self._refresh_all:
+                break
+
+    def _rotate_left(self, z):
+        y = super()._rotate_left(z)
+        self._update(z)
+        self._update(y)
+        return y
+
+    def _rotate_right(self, z):
+        y = super()._rotate_right(z)
+        self._update(z)
+        self._update(y)
+        return y
+
+    def _build_balanced(self, keys, objects):
+        # Fill in max_high bottom-up after the balanced build
+        root = super()._build_balanced(keys, objects)
+        order = []
+        stack = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.right is not None:
+                stack.append(node.right)
+        for node in reversed(order):
+            self._update(node)
+        return root
+
+    def stab(self, point):
+        # Lazily yield every object whose interval [low, high] contains the point
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.max_high < point:
+                continue  # Every interval below ends before the point
+            if node.left is not None:
+                stack.append(node.left)
+            low, high = node.key[0], node.key[1]
+            if low <= point:
+                if point <= high:
+                    yield node.value
+                if node.right is not None:
+                    stack.append(node.right)  # Intervals on the right start at or after low
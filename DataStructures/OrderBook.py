@@ -0,0 +1,107 @@
+import heapq
+
+
+class OrderBook:
+    def __init__(self):
+        self.books = {}  # property_id -> max-heap of (-bid_amount, sequence, bid_id)
+        self.bids = {}  # bid_id -> (Bid, sequence) for every live bid
+        self.client_bids = {}  # client -> {bid_id: Bid} of outstanding bids
+        self.stale = {}  # property_id -> number of withdrawn entries still in its heap
+        self.sequence = 0  # Earlier bids win ties at the same amount
+
+    def place(self, bid):
+        if bid.bid_id in self.bids:
+            raise ValueError(f"Bid {bid.bid_id} has already been placed")
+        self.sequence += 1
+        self.bids[bid.bid_id] = (bid, self.sequence)
+        book = self.books.get(bid.property_id)
+        if book is None:
+            book = self.books[bid.property_id] = []
+        heapq.heappush(book, (-bid.bid_amount, self.sequence, bid.bid_id))
+        client_bids = self.client_bids.get(bid.client)
+        if client_bids is None:
+            client_bids = self.client_bids[bid.client] = {}
+        client_bids[bid.bid_id] = bid
+
+    def withdraw(self, bid_id):
+        entry = self.bids.pop(bid_id, None)
+        if entry is None:
+            raise KeyError(f"Bid {bid_id} is not outstanding")
+        bid = entry[0]
+        client_bids = self.client_bids[bid.client]
+        del client_bids[bid_id]
+        if not client_bids:
+            del self.client_bids[bid.client]
+
+        # The heap entry is dropped lazily, or the heap is rebuilt once it is mostly withdrawn bids
+        book = self.books[bid.property_id]
+        stale = self.stale.get(bid.property_id, 0) + 1
+        if stale > len(book) // 2:
+            book[:] = [item for item in book if self._is_live(item)]
+            heapq.heapify(book)
+            stale = 0
+        self._set_stale(bid.property_id, stale)
+        if not book:
+            del self.books[bid.property_id]
+        return bid
+
+    def _is_live(self, item):
+        entry = self.bids.get(item[2])
+        return entry is not None and entry[1] == item[1]
+
+    def _set_stale(self, property_id, stale):
+        if stale:
+            self.stale[property_id] = stale
+        else:
+            self.stale.pop(property_id, None)
+
+    def _clean_top(self, property_id):
+        # Pop withdrawn bids off the top of the property's heap
+        book = self.books.get(property_id)
+        if book is None:
+            return None
+        stale = self.stale.get(property_id, 0)
+        while book and not self._is_live(book[0]):
+            heapq.heappop(book)
+            stale -= 1
+        self._set_stale(property_id, stale)
+        if not book:
+            del self.books[property_id]
+            return None
+        return book
+
+    def best_bid(self, property_id):
+        book = self._clean_top(property_id)
+        return self.bids[book[0][2]][0] if book else None
+
+    def top_bids(self, property_id, k):
+        # The k highest live bids in O(k log n): pop them off the heap and push them back
+        book = self._clean_top(property_id)
+        if not book or k <= 0:
+            return []
+        taken = []
+        result = []
+        while book and len(result) < k:
+            item = heapq.heappop(book)
+            if self._is_live(item):
+                taken.append(item)
+                result.append(self.bids[item[2]][0])
+            else:
+                self.stale[property_id] = self.stale.get(property_id, 0) - 1
+        for item in taken:
+            heapq.heappush(book, item)
+        self._set_stale(property_id, self.stale.get(property_id, 0))
+        return result
+
+    def bids_for_client(self, client):
+        return list(self.client_bids.get(client, {}).values())
+
+    def get(self, bid_id):
+        entry = self.bids.get(bid_id)
+        return entry[0] if entry is not None else None
+
+    def __len__(self):
+        return len(self.bids)
+
+    def __iter__(self):
+        return (entry[0] for entry in self.bids.values())
@@ -0,0 +1,111 @@
+from DataStructures.BinaryTree import BinaryTree
+
+
+class PersistentTree(BinaryTree):
+    # AVL tree whose nodes are never changed once they are reachable from a root. insert and delete copy the nodes
+    # on the path from the root (and the ones a rotation moves) and publish the new version with a single assignment
+    # to self.root, so a snapshot taken at any point stays a complete, unchanging tree. bulk_load and insert_many
+    # already build fresh nodes. Nodes that no version shares any more are freed by reference counting
+    def insert(self, obj):
+        try:
+            key = self._get_key(obj)
+        except AttributeError:
+            raise ValueError(f"Object must have a '{self.sortable_property}' attribute") from None
+        # Walk down, then copy the path bottom-up; above the point where the subtree height stops changing the
+        # copies only need relinking, not rebalancing
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        child = self.node_type(obj, key)
+        settled = False
+        for node in reversed(path):
+            copy = self._copy(node)
+            if key < node.key:
+                copy.left = child
+            else:
+                copy.right = child
+            child = copy if settled else self._balance(copy)
+            settled = settled or child.height == node.height
+        self.root = child
+        self.count += 1
+        self.inserts += 1
+
+    def delete(self, key):
+        root, found = self._delete(self.root, key)
+        if found:
+            self.root = root
+            self.count -= 1
+        return found
+
+    def _delete(self, node, key):
+        if node is None:
+            return None, False
+        if key != node.key:
+            if key < node.key:
+                left, found = self._delete(node.left, key)
+                if not found:
+                    return node, False
+                copy = self._copy(node)
+                copy.left = left
+            else:
+                right, found = self._delete(node.right, key)
+                if not found:
+                    return node, False
+                copy = self._copy(node)
+                copy.right = right
+            return self._balance(copy), True
+        if node.left is None:
+            return node.right, True
+        if node.right is None:
+            return node.left, True
+        # Two children: a new node holding the inorder successor replaces this one
+        successor = node.right
+        while successor.left is not None:
+            successor = successor.left
+        replacement = self.node_type(successor.value, successor.key)
+        replacement.left = node.left
+        replacement.right = self._delete_min(node.right)
+        return self._balance(replacement), True
+
+    def _delete_min(self, node):
+        if node.left is None:
+            return node.right
+        copy = self._copy(node)
+        copy.left = self._delete_min(node.left)
+        return self._balance(copy)
+
+    def _copy(self, node):
+        copy = self.node_type(node.value, node.key)
+        copy.left = node.left
+        copy.right = node.right
+        copy.height = node.height
+        return copy
+
+    # Rotations relink the child they lift as well, which older versions may still share
+    def _rotate_left(self, z):
+        z = self._copy(z)
+        z.right = self._copy(z.right)
+        return super()._rotate_left(z)
+
+    def _rotate_right(self, z):
+        z = self._copy(z)
+        z.left = self._copy(z.left)
+        return super()._rotate_right(z)
+
+    def snapshot(self):
+        return TreeSnapshot(self)
+
+
+class TreeSnapshot(BinaryTree):
+    # Read-only view of one version of a PersistentTree; find, range, iteration and len work as on the tree
+    def __init__(self, tree):
+        super().__init__(tree.sortable_property)
+        self.root = tree.root
+        self.count = tree.count
+
+    def _read_only(self, *args):
+        raise TypeError("A tree snapshot is read-only")
+
+    insert = delete = bulk_load = insert_many = _read_only
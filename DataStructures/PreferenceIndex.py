@@ -0,0 +1,67 @@
+from .IntervalTree import IntervalTree
+
+
+class PreferenceIndex:
+    # Clients indexed by what they are looking for, so a new listing finds its interested clients
+    # without scanning them all: one interval tree of price ranges per (property type, amenity)
+    def __init__(self):
+        self.trees = {}  # (property_type, amenity) -> IntervalTree of clients by price range
+        self.entries = {}  # client_id -> (bucket keys, tree key) the client is indexed under
+
+    def add(self, client):
+        # Index the client's current preferences, replacing any earlier entry for the same id
+        self.remove(client.client_id)
+        key = (client.preferred_price_min, client.preferred_price_max, client.client_id)
+        buckets = [(client.preferred_property_type, amenity) for amenity in set(client.preferred_amenities)]
+        for bucket in buckets:
+            tree = self.trees.get(bucket)
+            if tree is None:
+                tree = self.trees[bucket] = IntervalTree('preferred_price_min', 'preferred_price_max', 'client_id')
+            tree.insert(client)
+        self.entries[client.client_id] = (buckets, key)
+
+    def add_many(self, clients):
+        # Index a batch of clients, bulk-building each bucket's tree
+        batches = {}
+        for client in {client.client_id: client for client in clients}.values():  # The last entry for an id wins
+            self.remove(client.client_id)
+            key = (client.preferred_price_min, client.preferred_price_max, client.client_id)
+            buckets = [(client.preferred_property_type, amenity) for amenity in set(client.preferred_amenities)]
+            for bucket in buckets:
+                batches.setdefault(bucket, []).append(client)
+            self.entries[client.client_id] = (buckets, key)
+        for bucket, batch in batches.items():
+            tree = self.trees.get(bucket)
+            if tree is None:
+                tree = self.trees[bucket] = IntervalTree('preferred_price_min', 'preferred_price_max', 'client_id')
+            tree.insert_many(batch)
+
+    def remove(self, client_id):
+        entry = self.entries.pop(client_id, None)
+        if entry is None:
+            return False
+        buckets, key = entry
+        for bucket in buckets:
+            tree = self.trees[bucket]
+            tree.delete(key)  # The stored key, since the client's attributes may have changed since
+            if not len(tree):
+                del self.trees[bucket]
+        return True
+
+    def match(self, property):
+        # Clients whose price range holds the price, who want this type and at least one of its amenities
+        seen = set()
+        for amenity in property.amenities:
+            tree = self.trees.get((property.property_type, amenity))
+            if tree is None:
+                continue
+            for client in tree.stab(property.price):
+                if client.client_id not in seen:
+                    seen.add(client.client_id)
+                    yield client
+
+    def __contains__(self, client_id):
+        return client_id in self.entries
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,290 @@
+import heapq
+import math
+from array import array
+from Entities.Amenity import amenities_to_mask, mask_to_amenities, amenity_matcher
+from Entities.Property import Property
+from Entities.PropertyType import PropertyType
+from .BitmaskColumn import mask_selection, matching_rows
+from .graph import EARTH_RADIUS_KM, haversine
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, queries fall back to Python loops over the columns
+    np = None
+
+PROPERTY_TYPES = list(PropertyType)  # Type code -> PropertyType
+PROPERTY_TYPE_CODES = {property_type: code for code, property_type in enumerate(PROPERTY_TYPES)}
+
+
+def property_type_code(property_type):
+    # Code of a PropertyType for the on-disk formats, -1 for None
+    if property_type is None:
+        return -1
+    code = PROPERTY_TYPE_CODES.get(property_type)
+    if code is None:
+        raise ValueError(f"Cannot store property type {property_type!r}, it must be a PropertyType or None")
+    return code
+
+
+def property_type_from_code(code):
+    # Inverse of property_type_code
+    return PROPERTY_TYPES[code] if code >= 0 else None
+
+
+class PropertyView:
+    # Lightweight read-only row of a PropertyStore, materialized on demand
+    __slots__ = ('_store', 'property_id')
+
+    def __init__(self, store, property_id):
+        self._store = store
+        self.property_id = property_id
+
+    def _row(self):
+        return self._store.rows[self.property_id]
+
+    @property
+    def price(self):
+        return self._store.prices[self._row()]
+
+    @property
+    def latitude(self):
+        return self._store.latitudes[self._row()]
+
+    @property
+    def longitude(self):
+        return self._store.longitudes[self._row()]
+
+    @property
+    def property_type(self):
+        return property_type_from_code(self._store.type_codes[self._row()])
+
+    @property
+    def amenity_mask(self):
+        return self._store.amenity_masks[self._row()]
+
+    @property
+    def amenities(self):
+        return mask_to_amenities(self.amenity_mask)
+
+    @property
+    def location(self):
+        return self._store.locations[self._store.location_refs[self._row()]]
+
+    def retPropName(self):
+        return self.property_id
+
+    def __eq__(self, other):
+        return isinstance(other, PropertyView) and other._store is self._store and other.property_id == self.property_id
+
+    def __hash__(self):
+        return hash((id(self._store), self.property_id))
+
+    def __str__(self):
+        amenities_list = ', '.join([amenity.value for amenity in self.amenities])
+        return f"Property ID: {self.property_id}\n" \
+               f"Price: ${self.price}\n" \
+               f"Amenities: {amenities_list}\n" \
+               f"Property Type: {self.property_type}\n" \
+               f"Location: {self.location}\n" \
+               f"Latitude: {self.latitude}\n" \
+               f"Longitude: {self.longitude}"
+
+
+class PropertyStore:
+    def __init__(self, detached=False):
+        # Hand out Property copies of rows instead of live PropertyViews, for readers that keep results after the
+        # lock they read them under is released (a delete moves rows, so a view could read another row or none)
+        self.detached = detached
+        # One typed array per Property attribute, all indexed by row
+        self.ids = array('q')
+        self.prices = array('d')
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.type_codes = array('b')
+        self.amenity_masks = array('H')
+        self.location_refs = array('l')  # Index into the interned location table
+        self.locations = []  # Interned location strings
+        self.location_index = {}  # Location string -> index in self.locations
+        self.rows = {}  # property_id -> row
+
+    def _intern_location(self, location):
+        index = self.location_index.get(location)
+        if index is None:
+            index = self.location_index[location] = len(self.locations)
+            self.locations.append(location)
+        return index
+
+    def insert(self, obj):
+        # Add a Property (or any object with the same attributes); an existing id is overwritten in place
+        mask = getattr(obj, 'amenity_mask', None)
+        if mask is None:
+            mask = amenities_to_mask(obj.amenities)
+        values = (obj.price, obj.latitude, obj.longitude, property_type_code(obj.property_type), mask,
+                  self._intern_location(obj.location))
+
+        row = self.rows.get(obj.property_id)
+        if row is not None:
+            (self.prices[row], self.latitudes[row], self.longitudes[row], self.type_codes[row],
+             self.amenity_masks[row], self.location_refs[row]) = values
+            return
+
+        self.rows[obj.property_id] = len(self.ids)
+        self.ids.append(obj.property_id)
+        self.prices.append(values[0])
+        self.latitudes.append(values[1])
+        self.longitudes.append(values[2])
+        self.type_codes.append(values[3])
+        self.amenity_masks.append(values[4])
+        self.location_refs.append(values[5])
+
+    def insert_many(self, objects):
+        for obj in objects:
+            self.insert(obj)
+
+    def bulk_load(self, ids, prices, latitudes, longitudes, type_codes, amenity_masks, location_refs, locations):
+        # Replace the contents with ready-made columns, e.g. read back from a snapshot
+        self.ids = array('q', ids)
+        self.prices = array('d', prices)
+        self.latitudes = array('d', latitudes)
+        self.longitudes = array('d', longitudes)
+        self.type_codes = array('b', type_codes)
+        self.amenity_masks = array('H', amenity_masks)
+        self.location_refs = array('l', location_refs)
+        self.locations = list(locations)
+        self.location_index = {location: index for index, location in enumerate(self.locations)}
+        self.rows = dict(zip(self.ids, range(len(self.ids))))
+
+    def delete(self, property_id):
+        row = self.rows.pop(property_id, None)
+        if row is None:
+            return False
+        # Move the last row into the hole so every column stays contiguous
+        last = len(self.ids) - 1
+        for column in (self.ids, self.prices, self.latitudes, self.longitudes,
+                       self.type_codes, self.amenity_masks, self.location_refs):
+            value = column.pop()
+            if row < last:
+                column[row] = value
+        if row < last:
+            self.rows[self.ids[row]] = row
+        return True
+
+    def _object(self, property_id):
+        if not self.detached:
+            return PropertyView(self, property_id)
+        row = self.rows[property_id]
+        return Property(property_id, self.prices[row], mask_to_amenities(self.amenity_masks[row]),
+                        property_type_from_code(self.type_codes[row]), self.locations[self.location_refs[row]],
+                        self.latitudes[row], self.longitudes[row])
+
+    def _objects(self, property_ids):
+        # Lazily materialize rows by id, skipping ids deleted since they were selected
+        rows = self.rows
+        for property_id in property_ids:
+            if property_id in rows:
+                yield self._object(property_id)
+
+    def find(self, property_id):
+        return self._object(property_id) if property_id in self.rows else None
+
+    def __contains__(self, property_id):
+        return property_id in self.rows
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        # Rows in storage order (not sorted by id)
+        return self._objects(list(self.ids))
+
+    def get_all_objects(self):
+        return list(self)
+
+    def _views(self, rows):
+        ids = self.ids
+        return [self._object(ids[row]) for row in rows]
+
+    def _distances(self, latitude, longitude):
+        # Haversine distance from the point to every row, as one vectorized pass
+        lat1 = math.radians(latitude)
+        lat2 = np.radians(np.frombuffer(self.latitudes, dtype=np.float64))
+        dlon = np.radians(np.frombuffer(self.longitudes, dtype=np.float64)) - math.radians(longitude)
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def nearest(self, latitude, longitude, n=10, exclude=None):
+        # The n rows closest to the point, nearest first; exclude is a property_id to skip
+        if n <= 0 or not self.ids:
+            return []
+        excluded_row = self.rows.get(exclude) if exclude is not None else None
+
+        if np is None:
+            candidates = ((haversine(latitude, longitude, self.latitudes[row], self.longitudes[row]), row)
+                          for row in range(len(self.ids)) if row != excluded_row)
+            return self._views(row for _, row in heapq.nsmallest(n, candidates))
+
+        distances = self._distances(latitude, longitude)
+        if excluded_row is not None:
+            distances[excluded_row] = np.inf
+        size = len(distances) - (excluded_row is not None)
+        n = min(n, size)
+        rows = np.argpartition(distances, n - 1)[:n] if n < len(distances) else np.arange(len(distances))
+        rows = rows[np.argsort(distances[rows], kind='stable')][:n]
+        return self._views(rows.tolist())
+
+    # The lazy queries select matching ids in one pass and materialize rows as they are consumed. No NumPy view of a
+    # column stays alive between items, since the columns cannot be resized while one exists
+
+    def within_radius(self, latitude, longitude, radius_km):
+        return self._objects(self._ids_within_radius(latitude, longitude, radius_km))
+
+    def _ids_within_radius(self, latitude, longitude, radius_km):
+        ids = self.ids
+        if np is None:
+            return [ids[row] for row in range(len(ids))
+                    if haversine(latitude, longitude, self.latitudes[row], self.longitudes[row]) <= radius_km]
+        if not ids:
+            return []
+        return [ids[row] for row in np.flatnonzero(self._distances(latitude, longitude) <= radius_km).tolist()]
+
+    def within_bounds(self, min_latitude, min_longitude, max_latitude, max_longitude):
+        return self._objects(self._ids_within_bounds(min_latitude, min_longitude, max_latitude, max_longitude))
+
+    def _ids_within_bounds(self, min_latitude, min_longitude, max_latitude, max_longitude):
+        span = 360 if max_longitude - min_longitude >= 360 else (max_longitude - min_longitude) % 360
+        ids = self.ids
+        if np is None:
+            return [ids[row] for row in range(len(ids))
+                    if (min_latitude <= self.latitudes[row] <= max_latitude and
+                        (self.longitudes[row] - min_longitude) % 360 <= span)]
+        if not ids:
+            return []
+        latitudes = np.frombuffer(self.latitudes, dtype=np.float64)
+        longitudes = np.frombuffer(self.longitudes, dtype=np.float64)
+        selected = (latitudes >= min_latitude) & (latitudes <= max_latitude) & ((longitudes - min_longitude) % 360 <= span)
+        return [ids[row] for row in np.flatnonzero(selected).tolist()]
+
+    def filter(self, min_price, max_price, property_type, wanted, match='any', k=1):
+        # Rows in the price range with the given type whose amenity masks match, ordered by (price, id)
+        matches = amenity_matcher(match, wanted, k)
+        type_code = -1 if property_type is None else PROPERTY_TYPE_CODES.get(property_type)
+        if type_code is None or not self.ids:
+            return []
+
+        if np is None:
+            rows = [row for row in range(len(self.ids))
+                    if self.type_codes[row] == type_code and min_price <= self.prices[row] <= max_price
+                    and matches(self.amenity_masks[row])]
+        else:
+            prices = np.frombuffer(self.prices, dtype=np.float64)
+            selected = ((np.frombuffer(self.type_codes, dtype=np.int8) == type_code) &
+                        (prices >= min_price) & (prices <= max_price) &
+                        mask_selection(self.amenity_masks, wanted, match, k))
+            rows = np.flatnonzero(selected).tolist()
+        rows.sort(key=lambda row: (self.prices[row], self.ids[row]))
+        return self._views(rows)
+
+    def screen(self, wanted, match='any', k=1):
+        # Ids of every row whose amenity mask matches, in one pass over the mask column
+        ids = self.ids
+        return [ids[row] for row in matching_rows(self.amenity_masks, wanted, match, k)]
@@ -5,6 +5,7 @@ class Queue:
         self.front = 0  # Index of the front element
         self.rear = -1  # Index of the rear element
         self.count = 0  # Number of elements in the queue
+        self.resizes = 0  # Times the buffer was doubled
 
     def _resize(self):
         # Double the size of the queue when it's full
@@ -20,6 +21,7 @@ class Queue:
         self.size = new_size
         self.front = 0
         self.rear = self.count - 1
+        self.resizes += 1
 
     def enqueue(self, item):
         # Resize the queue if it's full
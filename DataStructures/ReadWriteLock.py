@@ -0,0 +1,76 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    # Many readers or one writer. Waiting writers block new readers, so a steady stream of readers cannot starve them.
+    # Both sides are reentrant per thread and a writer may also read, since system methods call one another;
+    # a reader asking to write raises instead of deadlocking
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0  # Threads holding the read side
+        self._writer = None  # Ident of the thread holding the write side
+        self._writer_depth = 0  # Nested write acquisitions by that thread
+        self._waiting_writers = 0
+        self._local = threading.local()  # Nested read acquisitions of the current thread
+
+    def acquire_read(self):
+        local = self._local
+        depth = getattr(local, 'reads', 0)
+        if depth or self._writer == threading.get_ident():
+            local.reads = depth + 1
+            return
+        with self._condition:
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        local.reads = 1
+
+    def release_read(self):
+        local = self._local
+        local.reads -= 1
+        if local.reads == 0 and self._writer != threading.get_ident():
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            return
+        if getattr(self._local, 'reads', 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        self._writer_depth -= 1
+        if self._writer_depth == 0:
+            with self._condition:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
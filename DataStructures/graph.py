@@ -1,6 +1,32 @@
 import math
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the vectorized PropertyGraph mode needs it
+    np = None
+
+# Radius of the Earth in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Great-circle distance in kilometers between two (latitude, longitude) points
+def haversine(lat1, lon1, lat2, lon2):
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = math.sin(dlat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    # Distance in kilometers
+    return EARTH_RADIUS_KM * c
+
 class Property:
+    __slots__ = ('id', 'latitude', 'longitude')
+
     def __init__(self, id, latitude, longitude):
         self.id = id
         self.latitude = latitude
@@ -8,42 +34,83 @@ class Property:
 
     # Calculate distance between two properties using Haversine formula
     def distance_to(self, other_property):
-        # Radius of the Earth in kilometers
-        R = 6371.0
-        
-        lat1 = math.radians(self.latitude)
-        lon1 = math.radians(self.longitude)
-        lat2 = math.radians(other_property.latitude)
-        lon2 = math.radians(other_property.longitude)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        # Distance in kilometers
-        distance = R * c
-        return distance
+        return haversine(self.latitude, self.longitude, other_property.latitude, other_property.longitude)
 
 class PropertyGraph:
-    def __init__(self):
+    def __init__(self, vectorized=False, initial_size=1024):
         # This will store the properties as vertices in a graph
         self.properties = {}
+        self.vectorized = vectorized
+        if vectorized:
+            if np is None:
+                raise ImportError("numpy is required for a vectorized PropertyGraph")
+            # Contiguous coordinate columns (in radians) so distances are computed in one pass
+            self.ids = []  # Property id stored at each row
+            self.rows = {}  # Property id -> row in the coordinate arrays
+            self.latitudes = np.empty(initial_size, dtype=np.float64)
+            self.longitudes = np.empty(initial_size, dtype=np.float64)
 
     def Add_Property(self, id, latitude, longitude):
         # Create a Property object and add it to the graph
         if id not in self.properties:
             self.properties[id] = Property(id, latitude, longitude)
+            if self.vectorized:
+                self._append_coordinates(id, latitude, longitude)
         else:
             print(f"Property with id {id} already exists.")
 
+    def _append_coordinates(self, id, latitude, longitude):
+        row = len(self.ids)
+        if row == len(self.latitudes):
+            # Double the capacity when the arrays are full
+            self.latitudes = np.resize(self.latitudes, 2 * row)
+            self.longitudes = np.resize(self.longitudes, 2 * row)
+        self.latitudes[row] = math.radians(latitude)
+        self.longitudes[row] = math.radians(longitude)
+        self.rows[id] = row
+        self.ids.append(id)
+
+    def _distance_matrix(self, latitudes, longitudes):
+        # Haversine distances from each (latitude, longitude) query in radians to every stored property
+        size = len(self.ids)
+        lat2 = self.latitudes[:size]
+        lon2 = self.longitudes[:size]
+        lat1 = latitudes[:, None]
+        lon1 = longitudes[:, None]
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def _select_nearest(self, distances, n):
+        # Pick the n smallest distances of each row with a partial selection, then order only those
+        n = min(n, distances.shape[1])
+        if n <= 0:
+            return [[] for _ in range(distances.shape[0])]
+        if n < distances.shape[1]:
+            candidates = np.argpartition(distances, n - 1, axis=1)[:, :n]
+        else:
+            candidates = np.broadcast_to(np.arange(distances.shape[1]), distances.shape)
+        candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_distances = np.take_along_axis(candidate_distances, order, axis=1)
+
+        results = []
+        for row_candidates, row_distances in zip(candidates.tolist(), candidate_distances.tolist()):
+            results.append([(self.ids[i], d) for i, d in zip(row_candidates, row_distances) if d != math.inf])
+        return results
+
     def Get_Nearest_Properties(self, property_id, n=10):
         # Get the property object based on id
         if property_id not in self.properties:
             print(f"Property with id {property_id} does not exist.")
             return []
 
+        if self.vectorized:
+            row = self.rows[property_id]
+            distances = self._distance_matrix(self.latitudes[row:row + 1], self.longitudes[row:row + 1])
+            distances[0, row] = math.inf  # Don't compare the property with itself
+            return self._select_nearest(distances, n)[0]
+
         target_property = self.properties[property_id]
         
         # Create a list of tuples (property_id, distance)
@@ -61,6 +128,20 @@ class PropertyGraph:
         
         return nearest_properties
 
+    def Get_Nearest_To_Points(self, points, n=10, chunk_size=4_000_000):
+        # For each (latitude, longitude) query point return its nearest `n` properties as (id, distance) tuples
+        if not self.vectorized:
+            raise ValueError("Batch queries require a vectorized PropertyGraph")
+
+        points = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        # Bound the size of each distance matrix so large batches don't exhaust memory
+        rows_per_chunk = max(1, chunk_size // max(len(self.ids), 1))
+        results = []
+        for start in range(0, len(points), rows_per_chunk):
+            chunk = points[start:start + rows_per_chunk]
+            results.extend(self._select_nearest(self._distance_matrix(chunk[:, 0], chunk[:, 1]), n))
+        return results
+
     def print_properties(self):
         # Print all properties in the graph
         for prop in self.properties.values():
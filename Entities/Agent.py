@@ -5,6 +5,8 @@ from faker import Faker
 
 # Agent Class
 class Agent:
+    __slots__ = ('agent_id', 'name', 'assigned_properties')
+
     def __init__(self, agent_id: int, name: str, assigned_properties: List[int]):
         self.agent_id = agent_id
         self.name = name
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import partial
 
 # Enum for amenities (imported from Property class, same definition)
 class Amenity(Enum):
@@ -16,4 +17,37 @@ class Amenity(Enum):
     DISHWASHER = "Dishwasher"
     PARK = "Park"
     BALCONY = "Balcony"
-    STORAGE = "Storage"
\ No newline at end of file
+    STORAGE = "Storage"
+
+# Bit assigned to each amenity (in declaration order) so a set of amenities packs into one integer
+AMENITY_BITS = {amenity: 1 << index for index, amenity in enumerate(Amenity)}
+ALL_AMENITIES_MASK = (1 << len(AMENITY_BITS)) - 1
+
+def amenities_to_mask(amenities) -> int:
+    mask = 0
+    for amenity in amenities:
+        mask |= AMENITY_BITS[amenity]
+    return mask
+
+def mask_to_amenities(mask: int):
+    return tuple(amenity for amenity, bit in AMENITY_BITS.items() if mask & bit)
+
+# Amenity matching as bitwise operations on packed masks
+def matches_any(mask: int, wanted: int) -> bool:
+    return mask & wanted != 0
+
+def matches_all(mask: int, wanted: int) -> bool:
+    return mask & wanted == wanted
+
+def matches_at_least(mask: int, wanted: int, k: int) -> bool:
+    return (mask & wanted).bit_count() >= k
+
+def amenity_matcher(match: str, wanted: int, k: int = 1):
+    """Return a predicate on amenity masks for match mode 'any', 'all' or 'at_least' (k of wanted)."""
+    if match == 'any':
+        return partial(matches_any, wanted=wanted)
+    if match == 'all':
+        return partial(matches_all, wanted=wanted)
+    if match == 'at_least':
+        return partial(matches_at_least, wanted=wanted, k=k)
+    raise ValueError(f"Unknown amenity match mode '{match}'")
@@ -2,6 +2,8 @@ from datetime import datetime
 
 # Appointment Class
 class Appointment:
+    __slots__ = ('appointment_id', 'client', 'agent', 'property_id', 'date_time')
+
     def __init__(self, appointment_id: int, client: str, agent: str, property_id: int, date_time: datetime):
         self.appointment_id = appointment_id
         self.client = client
@@ -1,4 +1,6 @@
 class Bid:
+    __slots__ = ('bid_id', 'client', 'property_id', 'bid_amount')
+
     def __init__(self, bid_id, client, property_id, bid_amount):
         self.bid_id = bid_id
         self.client = client
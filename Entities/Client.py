@@ -1,12 +1,15 @@
 from enum import Enum
-from typing import List
-from .Amenity import Amenity
+from typing import List, Tuple
+from .Amenity import Amenity, amenities_to_mask
 import random
 from faker import Faker
 from .PropertyType import PropertyType
 
 # Client Class
 class Client:
+    __slots__ = ('client_id', 'name', 'preferred_price_min', 'preferred_price_max', '_preferred_amenities',
+                 'preferred_amenity_mask', 'preferred_property_type')
+
     def __init__(self, client_id: int, name: str, preferred_price_min: float, 
                  preferred_price_max: float, preferred_amenities: List[Amenity], 
                  preferred_property_type: PropertyType):
@@ -17,6 +20,16 @@ class Client:
         self.preferred_amenities = preferred_amenities
         self.preferred_property_type = preferred_property_type
 
+    @property
+    def preferred_amenities(self) -> Tuple[Amenity, ...]:
+        return self._preferred_amenities
+
+    @preferred_amenities.setter
+    def preferred_amenities(self, preferred_amenities: List[Amenity]):
+        # Stored as a tuple so the amenities cannot change in place behind the mask; assign a new list instead
+        self._preferred_amenities = tuple(preferred_amenities)
+        self.preferred_amenity_mask = amenities_to_mask(preferred_amenities)  # Packed bitmask of the amenities
+
     def __str__(self):
         amenities_list = ', '.join([amenity.value for amenity in self.preferred_amenities])
         return f"Client ID: {self.client_id}\n" \
@@ -1,11 +1,14 @@
-from typing import List
-from .Amenity import Amenity
+from typing import List, Tuple
+from .Amenity import Amenity, amenities_to_mask
 from faker import Faker
 import random
 from .PropertyType import PropertyType
 
 # Property Class
 class Property:
+    __slots__ = ('property_id', 'price', '_amenities', 'amenity_mask', 'property_type', 'location',
+                 'latitude', 'longitude')
+
     def __init__(self, property_id: int, price: float, amenities: List[Amenity], 
                  property_type: str, location: str, latitude: float, longitude: float):
         self.property_id = property_id
@@ -16,6 +19,16 @@ class Property:
         self.latitude = latitude
         self.longitude = longitude
 
+    @property
+    def amenities(self) -> Tuple[Amenity, ...]:
+        return self._amenities
+
+    @amenities.setter
+    def amenities(self, amenities: List[Amenity]):
+        # Stored as a tuple so the amenities cannot change in place behind the mask; assign a new list instead
+        self._amenities = tuple(amenities)
+        self.amenity_mask = amenities_to_mask(amenities)  # Packed bitmask of the amenities
+
     def __str__(self):
         amenities_list = ', '.join([amenity.value for amenity in self.amenities])
         return f"Property ID: {self.property_id}\n" \
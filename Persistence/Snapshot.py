@@ -0,0 +1,298 @@
+import gc
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+from Entities.Agent import Agent
+from Entities.Amenity import mask_to_amenities
+from Entities.Appointment import Appointment
+from Entities.Bid import Bid
+from Entities.Client import Client
+from Entities.Property import Property
+from DataStructures.PropertyStore import PropertyStore, PROPERTY_TYPES, property_type_code, property_type_from_code
+
+MAGIC = b'REMSSNAP'
+VERSION = 1
+
+# File layout: header, section directory, then each section's raw little-endian column data (8-byte aligned)
+_HEADER = struct.Struct('<8sII')  # magic, version, number of sections
+_SECTION = struct.Struct('<32scxxxxxxxQQ')  # name, array typecode, byte offset, item count
+
+# Values of fields that are not always ints (appointment clients and agents, bid clients...) are stored as a
+# tag column plus a value column: the int itself, an index into the string table (for strings and ISO
+# datetimes), or nothing
+_INT, _STRING, _NONE, _DATETIME = 0, 1, 2, 3
+
+
+class _StringTable:
+    # Interned strings, written as one UTF-8 blob plus code point offsets
+    def __init__(self):
+        self.strings = []
+        self.index = {}
+
+    def ref(self, string):
+        ref = self.index.get(string)
+        if ref is None:
+            ref = self.index[string] = len(self.strings)
+            self.strings.append(string)
+        return ref
+
+    def sections(self, name, sections):
+        offsets = array('q', [0])
+        total = 0
+        for string in self.strings:
+            total += len(string)
+            offsets.append(total)
+        sections[name + '.offsets'] = offsets
+        sections[name + '.text'] = array('B', ''.join(self.strings).encode('utf-8'))
+
+
+def _read_strings(sections, name):
+    offsets = sections[name + '.offsets']
+    text = sections[name + '.text'].tobytes().decode('utf-8')
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def _encode_values(values, strings, sections, name):
+    tags = array('b')
+    refs = array('q')
+    for value in values:
+        if value is None:
+            tags.append(_NONE)
+            refs.append(0)
+        elif isinstance(value, int):
+            tags.append(_INT)
+            refs.append(value)
+        elif isinstance(value, str):
+            tags.append(_STRING)
+            refs.append(strings.ref(value))
+        elif isinstance(value, datetime):
+            tags.append(_DATETIME)
+            refs.append(strings.ref(value.isoformat()))
+        else:
+            raise ValueError(f"Cannot store {value!r} in a snapshot, only ints, strings, datetimes and None are supported")
+    sections[name + '_tag'] = tags
+    sections[name] = refs
+
+
+def _decode_value(tag, ref, strings):
+    if tag == _INT:
+        return ref
+    if tag == _STRING:
+        return strings[ref]
+    if tag == _DATETIME:
+        return datetime.fromisoformat(strings[ref])
+    return None
+
+
+def _decode_values(sections, name, strings):
+    return [_decode_value(tag, ref, strings) for tag, ref in zip(sections[name + '_tag'], sections[name])]
+
+
+def _encode_numbers(values, sections, name):
+    # Prices and amounts: a float column plus a tag column marking the ones that were ints, so an int price loads
+    # back as an int like it does from the write-ahead log
+    numbers = array('d', values)
+    tags = array('b', [isinstance(value, int) for value in values])
+    for value, number, tag in zip(values, numbers, tags):
+        if tag and number != value:
+            raise ValueError(f"Cannot store {value!r} in a snapshot, ints must fit a float exactly")
+    sections[name + '_tag'] = tags
+    sections[name] = numbers
+
+
+def _decode_numbers(sections, name):
+    numbers = sections[name]
+    tags = sections.get(name + '_tag')
+    if tags is None or not any(tags):  # Compact stores keep float columns only
+        return numbers
+    return [int(number) if tag else number for tag, number in zip(tags, numbers)]
+
+
+def _property_sections(system, sections):
+    locations = _StringTable()
+    store = system.properties
+    if isinstance(store, PropertyStore):
+        # Copy the columns as they are, only the location table is rebuilt to drop unused entries
+        sections['properties.id'] = store.ids
+        sections['properties.price'] = store.prices
+        sections['properties.latitude'] = store.latitudes
+        sections['properties.longitude'] = store.longitudes
+        sections['properties.type'] = store.type_codes
+        sections['properties.amenities'] = store.amenity_masks
+        sections['properties.location'] = array('q', [locations.ref(store.locations[ref]) for ref in store.location_refs])
+    else:
+        properties = store.get_all_objects()
+        sections['properties.id'] = array('q', [property.property_id for property in properties])
+        _encode_numbers([property.price for property in properties], sections, 'properties.price')
+        sections['properties.latitude'] = array('d', [property.latitude for property in properties])
+        sections['properties.longitude'] = array('d', [property.longitude for property in properties])
+        sections['properties.type'] = array('b', [property_type_code(property.property_type) for property in properties])
+        sections['properties.amenities'] = array('H', [property.amenity_mask for property in properties])
+        sections['properties.location'] = array('q', [locations.ref(property.location) for property in properties])
+    locations.sections('locations', sections)
+
+
+def _write(path, sections):
+    # Write to a temporary file and rename it over the target, so a crash never leaves a torn snapshot
+    directory = []
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    for name, column in sections.items():
+        offset = (offset + 7) & ~7
+        directory.append((name, column, offset))
+        offset += len(column) * column.itemsize
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, len(sections)))
+        for name, column, offset in directory:
+            file.write(_SECTION.pack(name.encode('ascii'), column.typecode.encode('ascii'), offset, len(column)))
+        for name, column, offset in directory:
+            file.write(b'\0' * (offset - file.tell()))
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column = array(column.typecode, column)
+                column.byteswap()
+            column.tofile(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def save_snapshot(system, path, log_epoch=0):
+    # Write every property, client, agent, pending appointment and outstanding bid of the system to path.
+    # log_epoch marks the write-ahead logs whose records the snapshot already holds, see RealEstateSystem.compactLog
+    sections = {'log.epoch': array('q', [log_epoch])}
+    strings = _StringTable()
+    _property_sections(system, sections)
+
+    clients = system.clients.get_all_objects()
+    sections['clients.id'] = array('q', [client.client_id for client in clients])
+    _encode_values([client.name for client in clients], strings, sections, 'clients.name')
+    _encode_numbers([client.preferred_price_min for client in clients], sections, 'clients.price_min')
+    _encode_numbers([client.preferred_price_max for client in clients], sections, 'clients.price_max')
+    sections['clients.amenities'] = array('H', [client.preferred_amenity_mask for client in clients])
+    sections['clients.type'] = array('b', [property_type_code(client.preferred_property_type) for client in clients])
+
+    agents = system.agents.get_all_objects()
+    sections['agents.id'] = array('q', [agent.agent_id for agent in agents])
+    _encode_values([agent.name for agent in agents], strings, sections, 'agents.name')
+    assigned_offsets = array('q', [0])
+    assigned = array('q')
+    for agent in agents:
+        assigned.extend(agent.assigned_properties)
+        assigned_offsets.append(len(assigned))
+    sections['agents.assigned_offsets'] = assigned_offsets
+    sections['agents.assigned'] = assigned
+
+    appointments = list(system.appointments)  # Scheduling order, so equal start times dispatch as before
+    sections['appointments.id'] = array('q', [appointment.appointment_id for appointment in appointments])
+    _encode_values([appointment.client for appointment in appointments], strings, sections, 'appointments.client')
+    _encode_values([appointment.agent for appointment in appointments], strings, sections, 'appointments.agent')
+    _encode_values([appointment.property_id for appointment in appointments], strings, sections, 'appointments.property')
+    _encode_values([appointment.date_time for appointment in appointments], strings, sections, 'appointments.start')
+
+    bids = list(system.bids)  # Placement order, so earlier bids still win ties
+    sections['bids.id'] = array('q', [bid.bid_id for bid in bids])
+    _encode_values([bid.client for bid in bids], strings, sections, 'bids.client')
+    _encode_values([bid.property_id for bid in bids], strings, sections, 'bids.property')
+    _encode_numbers([bid.bid_amount for bid in bids], sections, 'bids.amount')
+
+    strings.sections('strings', sections)
+    _write(path, sections)
+
+
+def _read(path):
+    # Read each section straight from the file into its array, one copy per column. Loading consumes every column
+    # into new objects anyway, so memory-mapping the file would only add a copy out of the map
+    with open(path, 'rb') as file:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is not a RealEstateSystem snapshot")
+        magic, version, count = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a RealEstateSystem snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        directory = file.read(_SECTION.size * count)
+        sections = {}
+        for i in range(count):
+            name, typecode, offset, length = _SECTION.unpack_from(directory, i * _SECTION.size)
+            column = array(typecode.decode('ascii'))
+            file.seek(offset)
+            try:
+                column.fromfile(file, length)
+            except EOFError:
+                raise ValueError(f"{path} is a truncated RealEstateSystem snapshot") from None
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column.byteswap()
+            sections[name.rstrip(b'\0').decode('ascii')] = column
+    return sections
+
+
+def _type_codes(sections, name):
+    # Type codes of a section, checked before they reach a store that would read them back as types
+    codes = sections[name]
+    if codes and not -1 <= min(codes) <= max(codes) < len(PROPERTY_TYPES):
+        raise ValueError(f"Snapshot section {name} holds unknown property type codes")
+    return codes
+
+
+def load_snapshot(system, path):
+    # Fill an empty RealEstateSystem from a snapshot written by save_snapshot
+    sections = _read(path)
+    system.logEpoch = sections['log.epoch'][0] if 'log.epoch' in sections else 0
+    strings = _read_strings(sections, 'strings')
+    locations = _read_strings(sections, 'locations')
+
+    # Loading allocates millions of objects that all stay alive, so cyclic collection would only rescan them
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        if isinstance(system.properties, PropertyStore):
+            system.properties.bulk_load(sections['properties.id'], _decode_numbers(sections, 'properties.price'),
+                                        sections['properties.latitude'], sections['properties.longitude'],
+                                        _type_codes(sections, 'properties.type'), sections['properties.amenities'],
+                                        sections['properties.location'], locations)
+        else:
+            amenity_lists = {}  # Amenity mask -> amenities tuple, decoded once per distinct mask and shared
+            for mask in set(sections['properties.amenities']):
+                amenity_lists[mask] = mask_to_amenities(mask)
+            system.setProperty([
+                Property(property_id, price, amenity_lists[mask], property_type_from_code(code), locations[ref],
+                         latitude, longitude)
+                for property_id, price, mask, code, ref, latitude, longitude in zip(
+                    sections['properties.id'], _decode_numbers(sections, 'properties.price'),
+                    sections['properties.amenities'], _type_codes(sections, 'properties.type'),
+                    sections['properties.location'],
+                    sections['properties.latitude'], sections['properties.longitude'])])
+
+        names = _decode_values(sections, 'clients.name', strings)
+        system.setClients([
+            Client(client_id, name, price_min, price_max, mask_to_amenities(mask), property_type_from_code(code))
+            for client_id, name, price_min, price_max, mask, code in zip(
+                sections['clients.id'], names, _decode_numbers(sections, 'clients.price_min'),
+                _decode_numbers(sections, 'clients.price_max'),
+                sections['clients.amenities'], _type_codes(sections, 'clients.type'))])
+
+        names = _decode_values(sections, 'agents.name', strings)
+        offsets = sections['agents.assigned_offsets']
+        assigned = sections['agents.assigned']
+        for i, agent_id in enumerate(sections['agents.id']):
+            system.addAgent(Agent(agent_id, names[i], assigned[offsets[i]:offsets[i + 1]].tolist()))
+
+        for appointment_id, client, agent, property_id, start in zip(
+                sections['appointments.id'], _decode_values(sections, 'appointments.client', strings),
+                _decode_values(sections, 'appointments.agent', strings),
+                _decode_values(sections, 'appointments.property', strings),
+                _decode_values(sections, 'appointments.start', strings)):
+            system.scheduleAppointment(Appointment(appointment_id, client, agent, property_id, start))
+
+        for bid_id, client, property_id, amount in zip(
+                sections['bids.id'], _decode_values(sections, 'bids.client', strings),
+                _decode_values(sections, 'bids.property', strings), _decode_numbers(sections, 'bids.amount')):
+            system.placeBid(Bid(bid_id, client, property_id, amount))
+    finally:
+        if collecting:
+            gc.enable()
+    return system
@@ -0,0 +1,237 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from Entities.Agent import Agent
+from Entities.Amenity import mask_to_amenities
+from Entities.Appointment import Appointment
+from Entities.Bid import Bid
+from Entities.Client import Client
+from Entities.Property import Property
+from DataStructures.PropertyStore import property_type_code, property_type_from_code
+
+# Record operations
+ADD_PROPERTY = 1
+DELETE_PROPERTY = 2
+ADD_CLIENT = 3
+DELETE_CLIENT = 4
+ADD_AGENT = 5
+SCHEDULE_APPOINTMENT = 6
+CANCEL_APPOINTMENT = 7
+PLACE_BID = 8
+WITHDRAW_BID = 9
+LOG_EPOCH = 10  # First record of a compacted log: the snapshot epoch it continues from
+_OPERATIONS = range(ADD_PROPERTY, LOG_EPOCH + 1)
+
+# Every record is (payload length, CRC-32 of payload) followed by the payload: one operation byte and its fields
+_RECORD_HEADER = struct.Struct('<II')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+_UINT32 = struct.Struct('<I')
+
+
+def _pack_value(out, value):
+    # Tagged encoding, so fields keep their Python type (an int price stays an int)
+    if value is None:
+        out += b'n'
+    elif isinstance(value, int):
+        out += b'i'
+        out += _INT64.pack(value)
+    elif isinstance(value, float):
+        out += b'f'
+        out += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        out += b's'
+        out += _UINT32.pack(len(data))
+        out += data
+    elif isinstance(value, datetime):
+        data = value.isoformat().encode('ascii')
+        out += b't'
+        out += _UINT32.pack(len(data))
+        out += data
+    elif isinstance(value, (list, tuple)):
+        out += b'l'
+        out += _UINT32.pack(len(value))
+        for item in value:
+            _pack_value(out, item)
+    else:
+        raise ValueError(f"Cannot log {value!r}, only ints, floats, strings, datetimes, None and lists are supported")
+
+
+def _unpack_value(data, offset):
+    tag = data[offset]
+    offset += 1
+    if tag == 0x6e:  # 'n'
+        return None, offset
+    if tag == 0x69:  # 'i'
+        return _INT64.unpack_from(data, offset)[0], offset + 8
+    if tag == 0x66:  # 'f'
+        return _FLOAT64.unpack_from(data, offset)[0], offset + 8
+    if tag == 0x73 or tag == 0x74:  # 's', 't'
+        length = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        text = data[offset:offset + length].decode('utf-8')
+        return (text if tag == 0x73 else datetime.fromisoformat(text)), offset + length
+    if tag == 0x6c:  # 'l'
+        count = _UINT32.unpack_from(data, offset)[0]
+        offset += 4
+        items = []
+        for _ in range(count):
+            item, offset = _unpack_value(data, offset)
+            items.append(item)
+        return items, offset
+    raise ValueError(f"Unknown value tag {tag!r} in log record")
+
+
+def _fields(operation, obj):
+    # The fields recorded for an operation; obj is an entity, or an id for removals
+    if operation == ADD_PROPERTY:
+        return (obj.property_id, obj.price, obj.amenity_mask, property_type_code(obj.property_type),
+                obj.location, obj.latitude, obj.longitude)
+    if operation == ADD_CLIENT:
+        return (obj.client_id, obj.name, obj.preferred_price_min, obj.preferred_price_max,
+                obj.preferred_amenity_mask, property_type_code(obj.preferred_property_type))
+    if operation == ADD_AGENT:
+        return (obj.agent_id, obj.name, obj.assigned_properties)
+    if operation == SCHEDULE_APPOINTMENT:
+        return (obj.appointment_id, obj.client, obj.agent, obj.property_id, obj.date_time)
+    if operation == PLACE_BID:
+        return (obj.bid_id, obj.client, obj.property_id, obj.bid_amount)
+    return (obj,)
+
+
+def _entity(operation, fields):
+    # Rebuild what _fields recorded
+    if operation == ADD_PROPERTY:
+        property_id, price, mask, code, location, latitude, longitude = fields
+        return Property(property_id, price, mask_to_amenities(mask), property_type_from_code(code), location, latitude, longitude)
+    if operation == ADD_CLIENT:
+        client_id, name, price_min, price_max, mask, code = fields
+        return Client(client_id, name, price_min, price_max, mask_to_amenities(mask), property_type_from_code(code))
+    if operation == ADD_AGENT:
+        return Agent(*fields)
+    if operation == SCHEDULE_APPOINTMENT:
+        return Appointment(*fields)
+    if operation == PLACE_BID:
+        return Bid(*fields)
+    return fields[0]
+
+
+def _encode(operation, obj):
+    payload = bytearray((operation,))
+    for value in _fields(operation, obj):
+        _pack_value(payload, value)
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class WriteAheadLog:
+    def __init__(self, path, sync_every=1, sync_interval=None, fsync=True):
+        self.path = path
+        self.sync_every = sync_every  # Records buffered before a group commit
+        self.sync_interval = sync_interval  # Longest time in seconds a record stays buffered
+        self.fsync = fsync  # Force commits to disk, not just to the OS
+        self.file = open(path, 'ab')
+        self.pending = bytearray()  # Encoded records not yet written
+        self.pending_records = 0
+        self.last_commit = time.monotonic()
+        self.records = 0  # Records appended since the log was opened
+        self.commits = 0  # Group commits written
+        self.epoch = 0  # Compactions this log has been through, read back by replay
+        self.lock = threading.Lock()  # Writers of different collections of a thread-safe system append concurrently
+        self.closed = threading.Event()
+        self.flusher = None  # Commits records that sit past sync_interval when no later append comes to do it
+        if sync_interval is not None:
+            self.flusher = threading.Thread(target=self._flush_periodically, name='wal-flush', daemon=True)
+            self.flusher.start()
+
+    def append(self, operation, obj):
+        record = _encode(operation, obj)
+        with self.lock:
+            self.pending += record
+            self.pending_records += 1
+            self.records += 1
+            if self.pending_records >= self.sync_every or (
+                    self.sync_interval is not None and time.monotonic() - self.last_commit >= self.sync_interval):
+                self._commit()
+
+    def commit(self):
+        with self.lock:
+            self._commit()
+
+    def _commit(self):
+        # Write every buffered record in one call, then make it durable
+        if self.pending:
+            self.file.write(self.pending)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+            self.pending.clear()
+            self.pending_records = 0
+            self.commits += 1
+        self.last_commit = time.monotonic()
+
+    def _flush_periodically(self):
+        timeout = self.sync_interval
+        while not self.closed.wait(timeout):
+            with self.lock:
+                timeout = self.last_commit + self.sync_interval - time.monotonic()
+                if timeout <= 0:
+                    self._commit()
+                    timeout = self.sync_interval
+
+    def replay(self, since_epoch=0):
+        # Yield (operation, entity or id) for every complete record, cutting off a torn tail left by a crash. A log
+        # from before epoch since_epoch was already folded into the snapshot being restored, so it yields nothing
+        self.commit()
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        self.epoch = 0
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            payload = data[start:start + length]
+            if length == 0 or len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            operation = payload[0]
+            if operation not in _OPERATIONS:
+                raise ValueError(f"Unknown operation {operation} in log record at byte {offset} of {self.path}")
+            fields = []
+            position = 1
+            while position < length:
+                value, position = _unpack_value(payload, position)
+                fields.append(value)
+            offset = start + length
+            if operation == LOG_EPOCH:
+                self.epoch = fields[0]
+                continue
+            if self.epoch < since_epoch:
+                return
+            yield operation, _entity(operation, fields)
+        if offset < len(data):
+            self.file.truncate(offset)
+
+    def reset(self, epoch=None):
+        # Drop every record, once its effects are safe in a snapshot; the emptied log starts with its epoch
+        with self.lock:
+            self.pending.clear()
+            self.pending_records = 0
+            self.file.truncate(0)
+            if epoch is not None:
+                self.epoch = epoch
+            if self.epoch:
+                self.file.write(_encode(LOG_EPOCH, self.epoch))
+                self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+
+    def close(self):
+        self.closed.set()
+        if self.flusher is not None:
+            self.flusher.join()
+        with self.lock:
+            self._commit()
+            self.file.close()
@@ -0,0 +1,60 @@
+import gc
+import multiprocessing
+import os
+import threading
+import warnings
+
+_system = None  # Set in each worker process only, by _init_worker, to the system it inherited at fork
+
+
+def _init_worker(system):
+    # Freezing the GC here moves every inherited object out of the worker's collections, so they do not touch
+    # (and copy) the pages shared copy-on-write with the parent. Only the worker process is affected
+    global _system
+    gc.freeze()
+    _system = system
+
+
+def _recommend(system, client_ids, number_n):
+    results = []
+    for client_id in client_ids:
+        client = system.getClient(client_id)
+        if client is not None:
+            results.append((client_id, [prop.property_id for prop in system.recommendProperties(client, number_n)]))
+    return results
+
+
+def _recommend_chunk(task):
+    client_ids, number_n = task
+    return _recommend(_system, client_ids, number_n)
+
+
+def recommend_all(system, number_n=10, workers=None, chunk_size=500):
+    # Lazily yield (client_id, [property_id, ...]) for every client, in completion order when parallel
+    client_ids = [client.client_id for client in system.clients]
+    chunks = [client_ids[i:i + chunk_size] for i in range(0, len(client_ids), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    serial = workers == 1 or len(chunks) <= 1
+    if not serial and 'fork' not in multiprocessing.get_all_start_methods():
+        warnings.warn("recommend_all needs the fork start method, computing in-process", RuntimeWarning, stacklevel=2)
+        serial = True
+    # A forked child holds only the forking thread, so a lock another thread had at that moment is never released in
+    # it. Workers only read the system, so the locks that matter are the system's own: the collection locks and cache
+    # lock of a thread-safe system, which its other threads may hold. Threads that never touch those (a log flusher,
+    # another pool's handlers, a host application's threads) leave the fork safe
+    if not serial and system.threadSafety is not None and threading.active_count() > 1:
+        warnings.warn("recommend_all cannot fork a thread-safe system while other threads run, computing in-process",
+                      RuntimeWarning, stacklevel=2)
+        serial = True
+    if serial:
+        for chunk in chunks:
+            yield from _recommend(system, chunk, number_n)
+        return
+
+    # Workers get the system through the initializer: with fork it is inherited copy-on-write rather than
+    # pickled, and each task only carries a list of client ids
+    context = multiprocessing.get_context('fork')
+    with context.Pool(workers, initializer=_init_worker, initargs=(system,)) as pool:
+        for results in pool.imap_unordered(_recommend_chunk, [(chunk, number_n) for chunk in chunks]):
+            yield from results
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from DataStructures.OrderBook import OrderBook
+
+NEW_HIGH_BID = "new_high_bid"
+OUTBID = "outbid"
+
+
+class Notification:
+    __slots__ = ('kind', 'property_id', 'bid', 'created')
+
+    def __init__(self, kind, property_id, bid):
+        self.kind = kind  # NEW_HIGH_BID or OUTBID
+        self.property_id = property_id
+        self.bid = bid  # The bid that is now the highest
+        self.created = time.perf_counter()  # For measuring delivery latency
+
+    def __str__(self):
+        return f"{self.kind}: property {self.property_id} now at ${self.bid.bid_amount} (bid {self.bid.bid_id})"
+
+
+class Subscription:
+    def __init__(self, client, maxsize, overflow):
+        self.client = client
+        self.queue = asyncio.Queue(maxsize)  # Bounded so a slow client cannot grow memory without limit
+        self.overflow = overflow  # 'block' waits for the client, 'drop_oldest' discards its oldest notification
+        self.dropped = 0  # Notifications discarded under 'drop_oldest'
+
+    async def deliver(self, notification):
+        if self.overflow == 'block':
+            await self.queue.put(notification)
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(notification)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class BiddingEngine:
+    def __init__(self, order_book=None, inbox_size=1000, queue_size=100, overflow='drop_oldest', place=None):
+        if overflow not in ('block', 'drop_oldest'):
+            raise ValueError(f"Unknown overflow policy '{overflow}'")
+        self.order_book = order_book if order_book is not None else OrderBook()
+        # (bid) -> (placed, previous highest bid): places the bid only if it beats the highest one, as one step.
+        # RealEstateSystem passes placeBidIfHighest, so real-time bids take its locks and reach its log
+        self.place = place if place is not None else self._place
+        self.inbox_size = inbox_size  # Pending submissions per property before submitters wait
+        self.queue_size = queue_size  # Pending notifications per subscriber
+        self.overflow = overflow
+        self.inboxes = {}  # property_id -> asyncio.Queue of (bid, future), one worker drains each
+        self.workers = {}  # property_id -> worker task
+        self.subscribers = {}  # property_id -> {client: Subscription}
+        self.accepted = 0
+        self.rejected = 0
+
+    def open(self, property_id):
+        # Start accepting bids for a property; its worker starts on the first submission
+        if property_id not in self.inboxes:
+            self.inboxes[property_id] = asyncio.Queue(self.inbox_size)
+
+    def is_open(self, property_id):
+        return property_id in self.inboxes
+
+    def subscribe(self, client, property_id):
+        subscribers = self.subscribers.setdefault(property_id, {})
+        subscription = subscribers.get(client)
+        if subscription is None:
+            subscription = subscribers[client] = Subscription(client, self.queue_size, self.overflow)
+        return subscription
+
+    def unsubscribe(self, client, property_id):
+        self.subscribers.get(property_id, {}).pop(client, None)
+
+    async def submit(self, bid):
+        # Queue the bid behind earlier bids on the same property and wait for the verdict
+        inbox = self.inboxes.get(bid.property_id)
+        if inbox is None:
+            raise KeyError(f"Property {bid.property_id} is not open for bidding")
+        if bid.property_id not in self.workers:
+            self.workers[bid.property_id] = asyncio.get_running_loop().create_task(self._run(bid.property_id, inbox))
+        future = asyncio.get_running_loop().create_future()
+        await inbox.put((bid, future))  # Waits when the property is backed up
+        return await future
+
+    async def _run(self, property_id, inbox):
+        # Bids on one property are handled one at a time, so no lock is shared across properties
+        while True:
+            bid, future = await inbox.get()
+            try:
+                accepted = await self._handle(property_id, bid)
+            except Exception as error:
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                if not future.done():
+                    future.set_result(accepted)
+
+    def _place(self, bid):
+        previous = self.order_book.best_bid(bid.property_id)
+        if previous is not None and bid.bid_amount <= previous.bid_amount:
+            return False, previous
+        self.order_book.place(bid)
+        return True, previous
+
+    async def _handle(self, property_id, bid):
+        placed, previous = self.place(bid)
+        if not placed:
+            self.rejected += 1
+            return False
+
+        self.accepted += 1
+        subscribers = self.subscribers.get(property_id)
+        if subscribers:
+            for subscription in list(subscribers.values()):
+                await subscription.deliver(Notification(NEW_HIGH_BID, property_id, bid))
+            if previous is not None and previous.client != bid.client:
+                outbid = subscribers.get(previous.client)
+                if outbid is not None:
+                    await outbid.deliver(Notification(OUTBID, property_id, bid))
+        return True
+
+    async def close(self):
+        for worker in self.workers.values():
+            worker.cancel()
+        await asyncio.gather(*self.workers.values(), return_exceptions=True)
+        self.workers.clear()
+        # Fresh inboxes so the engine can be used again from another event loop
+        for property_id in self.inboxes:
+            self.inboxes[property_id] = asyncio.Queue(self.inbox_size)
@@ -0,0 +1,152 @@
+import functools
+import multiprocessing
+import random
+from collections import deque
+from faker import Faker
+from Entities.Agent import Agent
+from Entities.Amenity import Amenity
+from Entities.Client import Client
+from Entities.Property import Property
+from Entities.PropertyType import PropertyType
+
+try:
+    import numpy as np
+except ImportError:  # Fall back to drawing one row at a time with random
+    np = None
+
+AMENITIES = list(Amenity)
+PROPERTY_TYPES = list(PropertyType)
+
+
+@functools.lru_cache(maxsize=8)
+def _pools(seed, pool_size):
+    # Faker is slow per call, so names and address parts are sampled once per (seed, pool_size) and rows pick from them.
+    # Seeding Faker makes the pools, and so every row, the same in every process
+    fake = Faker()
+    fake.seed_instance(seed)
+    return {
+        'names': [fake.name() for _ in range(pool_size)],
+        'streets': [fake.street_address() for _ in range(pool_size)],
+        'cities': [fake.city() for _ in range(pool_size)],
+        'zip_codes': [fake.zipcode_in_state("NJ") for _ in range(pool_size)],
+    }
+
+
+def _property_columns(rng, count):
+    # One vectorized draw per column; amenities are the first 1-5 entries of a random permutation per row
+    amenity_counts = rng.integers(1, 6, count).tolist()
+    amenity_orders = np.argsort(rng.random((count, len(AMENITIES))), axis=1).tolist()
+    return (np.round(rng.uniform(100000, 1000000, count), 2).tolist(),
+            [order[:k] for order, k in zip(amenity_orders, amenity_counts)],
+            rng.integers(0, len(PROPERTY_TYPES), count).tolist(),
+            rng.integers(0, 1 << 62, (3, count)).tolist(),
+            np.round(rng.uniform(39.8, 41.4, count), 6).tolist(),  # New Jersey latitude range
+            np.round(rng.uniform(-75.5, -73.5, count), 6).tolist())  # New Jersey longitude range
+
+
+def _property_rows(rng, count):
+    for _ in range(count):
+        yield (round(rng.uniform(100000, 1000000), 2),
+               rng.sample(range(len(AMENITIES)), rng.randint(1, 5)),
+               rng.randrange(len(PROPERTY_TYPES)),
+               (rng.getrandbits(62), rng.getrandbits(62), rng.getrandbits(62)),
+               round(rng.uniform(39.8, 41.4), 6),
+               round(rng.uniform(-75.5, -73.5), 6))
+
+
+def _make_properties(rng, pools, start_id, count):
+    streets, cities, zip_codes = pools['streets'], pools['cities'], pools['zip_codes']
+    size = len(streets)
+    if np is not None:
+        prices, amenity_picks, types, (street_picks, city_picks, zip_picks), latitudes, longitudes = \
+            _property_columns(rng, count)
+        rows = zip(prices, amenity_picks, types, zip(street_picks, city_picks, zip_picks), latitudes, longitudes)
+    else:
+        rows = _property_rows(rng, count)
+    properties = []
+    for property_id, (price, picks, type_index, (street, city, zip_code), latitude, longitude) in \
+            enumerate(rows, start_id):
+        properties.append(Property(
+            property_id, price, [AMENITIES[pick] for pick in picks], PROPERTY_TYPES[type_index],
+            f"{streets[street % size]}, {cities[city % size]}, New Jersey {zip_codes[zip_code % size]}",
+            latitude, longitude))
+    return properties
+
+
+def _client_rows(rng, count):
+    for _ in range(count):
+        price_min = round(rng.uniform(200000, 1000000), 2)
+        yield (rng.getrandbits(62), price_min, round(rng.uniform(price_min + 500, 1000000), 2),
+               rng.sample(range(len(AMENITIES)), rng.randint(1, 3)), rng.randrange(len(PROPERTY_TYPES)))
+
+
+def _make_clients(rng, pools, start_id, count):
+    names = pools['names']
+    if np is not None:
+        price_min = rng.uniform(200000, 1000000, count)
+        # Same range as uniform(min + 500, 1000000), drawn for the whole batch at once
+        price_max = price_min + 500 + rng.random(count) * (1000000 - price_min - 500)
+        amenity_counts = rng.integers(1, 4, count).tolist()
+        amenity_orders = np.argsort(rng.random((count, len(AMENITIES))), axis=1).tolist()
+        rows = zip(rng.integers(0, 1 << 62, count).tolist(), np.round(price_min, 2).tolist(),
+                   np.round(price_max, 2).tolist(),
+                   [order[:k] for order, k in zip(amenity_orders, amenity_counts)],
+                   rng.integers(0, len(PROPERTY_TYPES), count).tolist())
+    else:
+        rows = _client_rows(rng, count)
+    return [Client(client_id, names[name % len(names)], price_min, price_max, [AMENITIES[pick] for pick in picks],
+                   PROPERTY_TYPES[type_index])
+            for client_id, (name, price_min, price_max, picks, type_index) in enumerate(rows, start_id)]
+
+
+def _make_agents(rng, pools, start_id, count):
+    names = pools['names']
+    picks = rng.integers(0, len(names), count).tolist() if np is not None else \
+        [rng.randrange(len(names)) for _ in range(count)]
+    # Agent n is assigned properties 10(n-1)+1 .. 10n, as in Agent.create_random_agents
+    return [Agent(agent_id, names[pick], list(range((agent_id - 1) * 10 + 1, agent_id * 10 + 1)))
+            for agent_id, pick in zip(range(start_id, start_id + count), picks)]
+
+
+BUILDERS = {'property': _make_properties, 'client': _make_clients, 'agent': _make_agents}
+
+
+def _make_batch(task):
+    # Every batch draws from its own generator seeded by (seed, batch number), so the output does not depend on
+    # which process builds the batch or in what order; runs in a worker process when a pool is used
+    kind, seed, pool_size, batch, start_id, count = task
+    rng = np.random.default_rng([seed, batch]) if np is not None else random.Random(f"{seed}:{batch}")
+    return BUILDERS[kind](rng, _pools(seed, pool_size), start_id, count)
+
+
+def generate(kind, count, seed=0, start_id=1, batch_size=10000, workers=0, pool_size=1000):
+    # Lazily yield `count` entities of one kind with ids from start_id; the same arguments always give the same rows.
+    # With workers, batches are built in a process pool with at most two batches per worker in flight
+    if kind not in BUILDERS:
+        raise ValueError(f"Unknown entity kind '{kind}'")
+    tasks = ((kind, seed, pool_size, batch, start_id + offset, min(batch_size, count - offset))
+             for batch, offset in enumerate(range(0, count, batch_size)))
+    if not workers:
+        for task in tasks:
+            yield from _make_batch(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_make_batch, (task,)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def generate_properties(count, seed=0, **options):
+    return generate('property', count, seed, **options)
+
+
+def generate_clients(count, seed=0, **options):
+    return generate('client', count, seed, **options)
+
+
+def generate_agents(count, seed=0, **options):
+    return generate('agent', count, seed, **options)
@@ -0,0 +1,244 @@
+import csv
+import json
+import multiprocessing
+import time
+from collections import deque
+from itertools import islice
+from Entities.Amenity import Amenity
+from Entities.Client import Client
+from Entities.Property import Property
+from Entities.PropertyType import PropertyType
+
+PROPERTY_FIELDS = ('property_id', 'price', 'amenities', 'property_type', 'location', 'latitude', 'longitude')
+CLIENT_FIELDS = ('client_id', 'name', 'preferred_price_min', 'preferred_price_max', 'preferred_amenities',
+                 'preferred_property_type')
+AMENITY_SEPARATOR = '|'  # Separates amenities inside one CSV cell, e.g. "Parking|Gym"
+
+# Enum members by value ("Swimming Pool") or by name ("SWIMMING_POOL")
+_AMENITIES = {**{amenity.value: amenity for amenity in Amenity}, **{amenity.name: amenity for amenity in Amenity}}
+_PROPERTY_TYPES = {**{property_type.value: property_type for property_type in PropertyType},
+                   **{property_type.name: property_type for property_type in PropertyType}}
+
+
+class IngestStats:
+    def __init__(self, max_errors=100):
+        self.rows = 0  # Rows read from the feed
+        self.inserted = 0  # Entities handed to the system
+        self.rejected = 0  # Rows that failed validation
+        self.errors = []  # (row number, message) of the first max_errors rejected rows
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def reject(self, row_number, message):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row_number, message))
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.rows} rows, {self.inserted} inserted, {self.rejected} rejected "
+                f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)")
+
+
+def _number(row, field):
+    value = row.get(field)
+    if value is None or value == '':
+        raise ValueError(f"missing {field}")
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{field} is not a number: {value!r}")
+    if not isinstance(value, str):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{field} is not a number: {value!r}") from None
+
+
+def _integer(row, field):
+    value = _number(row, field)
+    if not isinstance(value, int):
+        raise ValueError(f"{field} is not an integer: {value!r}")
+    return value
+
+
+def _text(row, field):
+    value = row.get(field)
+    if value is None or value == '':
+        raise ValueError(f"missing {field}")
+    return str(value)
+
+
+def _amenities(row, field):
+    value = row.get(field)
+    if value is None or value == '':
+        return []
+    names = value.split(AMENITY_SEPARATOR) if isinstance(value, str) else value
+    try:
+        return [_AMENITIES[name.strip()] for name in names]
+    except (KeyError, AttributeError):
+        raise ValueError(f"unknown amenity in {value!r}") from None
+
+
+def _property_type(row, field):
+    value = row.get(field)
+    property_type = _PROPERTY_TYPES.get(value) if isinstance(value, str) else None
+    if property_type is None:
+        raise ValueError(f"unknown {field} {value!r}")
+    return property_type
+
+
+def property_from_row(row):
+    # Validate a parsed feed row and convert it to a Property, raising ValueError for a bad row
+    price = _number(row, 'price')
+    latitude = _number(row, 'latitude')
+    longitude = _number(row, 'longitude')
+    if not price >= 0:
+        raise ValueError(f"invalid price {price}")
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError(f"coordinates out of range ({latitude}, {longitude})")
+    return Property(_integer(row, 'property_id'), price, _amenities(row, 'amenities'),
+                    _property_type(row, 'property_type'), _text(row, 'location'), latitude, longitude)
+
+
+def client_from_row(row):
+    # Validate a parsed feed row and convert it to a Client, raising ValueError for a bad row
+    price_min = _number(row, 'preferred_price_min')
+    price_max = _number(row, 'preferred_price_max')
+    if not price_min <= price_max:
+        raise ValueError(f"preferred_price_min {price_min} is above preferred_price_max {price_max}")
+    return Client(_integer(row, 'client_id'), _text(row, 'name'), price_min, price_max,
+                  _amenities(row, 'preferred_amenities'), _property_type(row, 'preferred_property_type'))
+
+
+CONVERTERS = {'property': property_from_row, 'client': client_from_row}
+
+
+def _feed_format(path, feed_format):
+    if feed_format is None:
+        feed_format = 'csv' if str(path).lower().endswith('.csv') else 'jsonl'
+    if feed_format not in ('jsonl', 'csv'):
+        raise ValueError(f"Unknown feed format '{feed_format}'")
+    return feed_format
+
+
+def read_records(file, feed_format):
+    # Stage 1: yield raw records, JSONL lines as text and CSV rows as lists of cells (CSV cells may span lines)
+    if feed_format == 'csv':
+        yield from csv.reader(file)
+    else:
+        for line in file:
+            if line.strip():
+                yield line
+
+
+def _convert_chunk(kind, feed_format, header, first_row, records):
+    # Stages 2 and 3 for one chunk: parse, validate and convert; runs in a worker process when a pool is used
+    convert = CONVERTERS[kind]
+    entities = []
+    errors = []
+    for row_number, record in enumerate(records, first_row):
+        try:
+            if feed_format == 'csv':
+                if len(record) != len(header):
+                    raise ValueError(f"expected {len(header)} cells, found {len(record)}")
+                row = dict(zip(header, record))
+            else:
+                row = json.loads(record)
+                if not isinstance(row, dict):
+                    raise ValueError("row is not a JSON object")
+            entities.append(convert(row))
+        except ValueError as error:  # json.JSONDecodeError is a ValueError too
+            errors.append((row_number, str(error)))
+    return entities, errors
+
+
+def _chunks(records, chunk_size):
+    first_row = 1
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield first_row, chunk
+        first_row += len(chunk)
+
+
+def convert_records(records, kind, feed_format, header, chunk_size, workers, stats):
+    # Lazily yield converted entities in feed order, recording rejected rows in stats
+    if workers:
+        # At most two chunks per worker are in flight, so a slow consumer never lets the feed pile up in memory
+        with multiprocessing.Pool(workers) as pool:
+            pending = deque()
+            for first_row, chunk in _chunks(records, chunk_size):
+                stats.rows += len(chunk)
+                pending.append(pool.apply_async(_convert_chunk, (kind, feed_format, header, first_row, chunk)))
+                if len(pending) >= 2 * workers:
+                    yield from _collect(pending.popleft().get(), stats)
+            while pending:
+                yield from _collect(pending.popleft().get(), stats)
+        return
+    for first_row, chunk in _chunks(records, chunk_size):
+        stats.rows += len(chunk)
+        yield from _collect(_convert_chunk(kind, feed_format, header, first_row, chunk), stats)
+
+
+def _collect(result, stats):
+    entities, errors = result
+    for row_number, message in errors:
+        stats.reject(row_number, message)
+    return entities
+
+
+def ingest_feed(system, path, kind='property', feed_format=None, batch_size=10000, workers=0, chunk_size=2000,
+                progress=None, max_errors=100):
+    # Stream a JSONL or CSV feed of properties or clients into the system in batches; memory stays bounded by
+    # batch_size (plus two chunks per worker) however large the file is
+    if kind not in CONVERTERS:
+        raise ValueError(f"Unknown feed kind '{kind}'")
+    feed_format = _feed_format(path, feed_format)
+    insert = system.setProperty if kind == 'property' else system.setClients
+    stats = IngestStats(max_errors)
+    with open(path, newline='' if feed_format == 'csv' else None, encoding='utf-8') as file:
+        records = read_records(file, feed_format)
+        header = next(records, None) if feed_format == 'csv' else None
+        entities = convert_records(records, kind, feed_format, header, chunk_size, workers, stats)
+        # Stage 4: batch insert through the system's bulk path
+        while True:
+            batch = list(islice(entities, batch_size))
+            if not batch:
+                break
+            insert(batch)
+            stats.inserted += len(batch)
+            stats.elapsed = time.perf_counter() - stats.started
+            if progress is not None:
+                progress(stats)
+    stats.elapsed = time.perf_counter() - stats.started
+    return stats
+
+
+def write_feed(path, entities, kind='property', feed_format=None):
+    # Write entities as a feed that ingest_feed reads back, e.g. for tests and benchmarks
+    feed_format = _feed_format(path, feed_format)
+    fields = PROPERTY_FIELDS if kind == 'property' else CLIENT_FIELDS
+    amenity_field = 'amenities' if kind == 'property' else 'preferred_amenities'
+    type_field = 'property_type' if kind == 'property' else 'preferred_property_type'
+    with open(path, 'w', newline='' if feed_format == 'csv' else None, encoding='utf-8') as file:
+        writer = csv.writer(file) if feed_format == 'csv' else None
+        if writer is not None:
+            writer.writerow(fields)
+        for entity in entities:
+            row = {field: getattr(entity, field) for field in fields}
+            row[amenity_field] = [amenity.value for amenity in row[amenity_field]]
+            row[type_field] = row[type_field].value
+            if writer is not None:
+                row[amenity_field] = AMENITY_SEPARATOR.join(row[amenity_field])
+                writer.writerow([row[field] for field in fields])
+            else:
+                file.write(json.dumps(row) + '\n')
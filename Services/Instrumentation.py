@@ -0,0 +1,175 @@
+import inspect
+import time
+from bisect import bisect_left
+from DataStructures.BinaryTree import BinaryTree
+from DataStructures.HashTable import HashTable
+from DataStructures.Queue import Queue
+
+# Latency bucket upper bounds in seconds: 1us doubling up to about 17s, plus +Inf
+BUCKETS = tuple(1e-6 * 2 ** i for i in range(25))
+PERCENTILES = (50, 95, 99)
+COLLECTIONS = ('properties', 'clients', 'agents', 'appointments', 'bids', 'clientPreferences')
+
+
+class LatencyHistogram:
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Observations per bucket, the last one unbounded
+        self.count = 0
+        self.total = 0.0  # Sum of observed seconds
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, q):
+        # Estimated by interpolating inside the bucket holding the q-th observation, like Prometheus'
+        # histogram_quantile, so it is exact to within one (factor of two) bucket
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                low = BUCKETS[index - 1] if index else 0.0
+                high = BUCKETS[index] if index < len(BUCKETS) else BUCKETS[-1]
+                return low + (high - low) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return BUCKETS[-1]
+
+
+class Instrumentation:
+    # Per-method call counts, errors and latency histograms for one RealEstateSystem. Methods are wrapped on the
+    # instance only while instrumentation is installed, so an uninstrumented system runs the plain class methods
+    def __init__(self, system, methods=None, exclude=()):
+        self.system = system
+        methods = list(methods) if methods is not None else instrumentable_methods(system)
+        self.methods = [name for name in methods if name not in exclude]
+        self.calls = {name: 0 for name in self.methods}
+        self.errors = {name: 0 for name in self.methods}
+        self.latencies = {name: LatencyHistogram() for name in self.methods}
+
+    def install(self):
+        # Instance attributes already in place (the lock wrappers of a thread-safe system) are wrapped in turn
+        self.previous = {name: vars(self.system).get(name) for name in self.methods}
+        for name in self.methods:
+            setattr(self.system, name, self._wrap(name, getattr(self.system, name)))
+
+    def uninstall(self):
+        for name, previous in self.previous.items():
+            if previous is None:
+                vars(self.system).pop(name, None)
+            else:
+                setattr(self.system, name, previous)
+
+    def _wrap(self, name, method):
+        calls = self.calls
+        errors = self.errors
+        observe = self.latencies[name].observe
+        perf_counter = time.perf_counter
+
+        def instrumented(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except BaseException:
+                errors[name] += 1
+                raise
+            finally:
+                observe(perf_counter() - start)
+                calls[name] += 1
+        instrumented.__wrapped__ = method
+        return instrumented
+
+    def reset(self):
+        # In place, since the installed wrappers hold on to these dicts and histograms
+        for name in self.methods:
+            self.calls[name] = 0
+            self.errors[name] = 0
+            self.latencies[name].clear()
+
+    def snapshot(self):
+        methods = {}
+        for name in self.methods:
+            histogram = self.latencies[name]
+            if not histogram.count:
+                continue
+            summary = {'count': self.calls[name], 'errors': self.errors[name],
+                       'mean_us': histogram.total / histogram.count * 1e6}
+            for q in PERCENTILES:
+                summary[f'p{q}_us'] = histogram.percentile(q) * 1e6
+            methods[name] = summary
+        return {'methods': methods, **gauges(self.system)}
+
+    def prometheus(self, prefix='rems'):
+        # Prometheus text exposition format
+        lines = [f'# TYPE {prefix}_method_calls_total counter']
+        lines += [f'{prefix}_method_calls_total{{method="{name}"}} {count}' for name, count in self.calls.items()
+                  if count]
+        lines.append(f'# TYPE {prefix}_method_errors_total counter')
+        lines += [f'{prefix}_method_errors_total{{method="{name}"}} {count}' for name, count in self.errors.items()
+                  if self.calls[name]]
+        lines.append(f'# TYPE {prefix}_method_latency_seconds histogram')
+        for name, histogram in self.latencies.items():
+            if not histogram.count:
+                continue
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{prefix}_method_latency_seconds_bucket{{method="{name}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{prefix}_method_latency_seconds_bucket{{method="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_method_latency_seconds_sum{{method="{name}"}} {histogram.total:.9f}')
+            lines.append(f'{prefix}_method_latency_seconds_count{{method="{name}"}} {histogram.count}')
+
+        state = gauges(self.system)
+        metrics = [
+            ('objects', 'gauge', 'collection', state['objects']),
+            ('tree_height', 'gauge', 'tree', _column(state['trees'], 'height')),
+            ('tree_inserts_total', 'counter', 'tree', _column(state['trees'], 'inserts')),
+            ('tree_rotations_total', 'counter', 'tree', _column(state['trees'], 'rotations')),
+            ('hashtable_load_factor', 'gauge', 'table', _column(state['hash_tables'], 'load_factor')),
+            ('hashtable_resizes_total', 'counter', 'table', _column(state['hash_tables'], 'resizes')),
+            ('queue_length', 'gauge', 'queue', _column(state['queues'], 'length')),
+            ('queue_resizes_total', 'counter', 'queue', _column(state['queues'], 'resizes')),
+        ]
+        for metric, kind, label, values in metrics:
+            lines.append(f'# TYPE {prefix}_{metric} {kind}')
+            lines += [f'{prefix}_{metric}{{{label}="{name}"}} {value}' for name, value in values.items()]
+        return '\n'.join(lines) + '\n'
+
+
+def _column(rows, field):
+    return {name: row[field] for name, row in rows.items()}
+
+
+def instrumentable_methods(system):
+    # Public instance methods; generators are left out since timing them would only time their creation
+    return [name for name, member in inspect.getmembers(type(system), inspect.isfunction)
+            if not name.startswith('_') and not inspect.isgeneratorfunction(member)]
+
+
+def gauges(system):
+    # Sizes and shape of the system's data structures, read on demand so they cost nothing between reads
+    objects = {}
+    for name in COLLECTIONS:
+        collection = getattr(system, name, None)
+        if collection is not None:
+            objects[name] = len(collection)
+    trees, hash_tables, queues = {}, {}, {}
+    for name, value in vars(system).items():
+        if isinstance(value, BinaryTree):
+            trees[name] = {'size': len(value), 'height': value.root.height if value.root else 0,
+                           'inserts': value.inserts, 'rotations': value.rotations,
+                           'rotations_per_insert': value.rotations / value.inserts if value.inserts else 0.0}
+        elif isinstance(value, HashTable):
+            hash_tables[name] = {'count': value.count, 'slots': value.size, 'tombstones': value.tombstones,
+                                 'load_factor': (value.count + value.tombstones) / value.size,
+                                 'resizes': value.resizes}
+        elif isinstance(value, Queue):
+            queues[name] = {'length': len(value), 'capacity': value.size, 'resizes': value.resizes}
+    return {'objects': objects, 'trees': trees, 'hash_tables': hash_tables, 'queues': queues}
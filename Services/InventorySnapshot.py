@@ -0,0 +1,31 @@
+import time
+
+
+class InventorySnapshot:
+    # Point-in-time, read-only view of a persistent system's trees. Later inserts, deletes and reloads publish new
+    # tree versions and leave this one as it was; its nodes are freed once no snapshot holds them
+    def __init__(self, system):
+        self.properties = system.properties.snapshot()
+        self.propertiesByPrice = system.propertiesByPrice.snapshot()
+        self.clients = system.clients.snapshot()
+        self.agents = system.agents.snapshot()
+        self.taken_at = time.time()
+
+    def getProperty(self, property_id):
+        return self.properties.find(property_id)
+
+    def getClient(self, client_id):
+        return self.clients.find(client_id)
+
+    def getAgent(self, agent_id):
+        return self.agents.find(agent_id)
+
+    def getAllProperties(self):
+        return self.properties.get_all_objects()
+
+    def getPropertiesInPriceRange(self, low, high):
+        # Keys are (price, property_id), so infinite ids take in every property at both end prices
+        return list(self.propertiesByPrice.range((low, float('-inf')), (high, float('inf'))))
+
+    def __len__(self):
+        return len(self.properties)
@@ -0,0 +1,210 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from DataStructures.graph import EARTH_RADIUS_KM, haversine
+
+MISSING = object()  # Returned by get() on a cache miss
+
+# Entries are filed under the buckets a changed property could fall in, so invalidation only checks those: preference
+# entries under (property type, price bucket), nearest-n entries under the geo grid cells their radius reaches
+PRICE_BUCKET = 50000.0  # Width of a price bucket
+GEO_CELL = 0.1  # Edge of a geo grid cell in degrees, about 11 km
+GEO_COLUMNS = round(360 / GEO_CELL)
+MAX_BUCKETS = 64  # Entries reaching more buckets than this go on a short list checked on every invalidation
+
+
+def _price_bucket(property_type, price):
+    return property_type, int(price // PRICE_BUCKET)
+
+
+def _geo_cell(latitude, longitude):
+    return 'geo', int((latitude + 90) // GEO_CELL), int((longitude + 180) // GEO_CELL) % GEO_COLUMNS
+
+
+class PreferenceScope:
+    # A filter-and-rank result depends on every property in this price range, type and amenity set
+    __slots__ = ('low', 'high', 'property_type', 'amenity_mask')
+
+    def __init__(self, low, high, property_type, amenity_mask):
+        self.low = low
+        self.high = high
+        self.property_type = property_type
+        self.amenity_mask = amenity_mask
+
+    def affected_by(self, property):
+        return (self.low <= property.price <= self.high and property.amenity_mask & self.amenity_mask != 0
+                and property.property_type == self.property_type)
+
+    def buckets(self):
+        # The price buckets of the range, or None when there are too many to file the entry under each
+        if self.low > self.high:
+            return []
+        if not (math.isfinite(self.low) and math.isfinite(self.high)):
+            return None
+        first, last = int(self.low // PRICE_BUCKET), int(self.high // PRICE_BUCKET)
+        if last - first >= MAX_BUCKETS:
+            return None
+        return [(self.property_type, bucket) for bucket in range(first, last + 1)]
+
+
+class GeoScope:
+    # A nearest-n result depends on every property within `radius_km` of the target, and on the target itself
+    __slots__ = ('latitude', 'longitude', 'radius_km', 'target_id')
+
+    def __init__(self, latitude, longitude, radius_km, target_id=None):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.radius_km = radius_km  # Distance to the farthest result, or infinity when fewer than n were found
+        self.target_id = target_id
+
+    def affected_by(self, property):
+        if property.property_id == self.target_id:
+            return True
+        if self.radius_km == float('inf'):
+            return True
+        return haversine(self.latitude, self.longitude, property.latitude, property.longitude) <= self.radius_km
+
+    def buckets(self):
+        # The grid cells of the circle's bounding box, or None when it reaches a pole or too many cells. The target
+        # itself is filed by id, since a replacement may have moved it
+        if not math.isfinite(self.radius_km):
+            return None
+        angle = self.radius_km / EARTH_RADIUS_KM
+        dlat = math.degrees(angle) + 1e-9
+        ratio = math.sin(angle) / math.cos(math.radians(self.latitude)) if angle < math.pi / 2 else 1.0
+        if self.latitude - dlat <= -90 or self.latitude + dlat >= 90 or ratio >= 1:
+            return None
+        dlon = math.degrees(math.asin(ratio)) + 1e-9
+        _, row_low, _ = _geo_cell(self.latitude - dlat, 0.0)
+        _, row_high, _ = _geo_cell(self.latitude + dlat, 0.0)
+        column_low = int((self.longitude - dlon + 180) // GEO_CELL)
+        column_high = int((self.longitude + dlon + 180) // GEO_CELL)
+        if (row_high - row_low + 1) * (column_high - column_low + 1) > MAX_BUCKETS:
+            return None
+        return [('geo', row, column % GEO_COLUMNS) for row in range(row_low, row_high + 1)
+                for column in range(column_low, column_high + 1)]
+
+
+class RecommendationCache:
+    def __init__(self, maxsize=10000, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize  # Entries kept before the least recently used is evicted
+        self.ttl = ttl  # Seconds an entry stays valid, None to keep entries until evicted or invalidated
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (value, expires_at, scope, buckets), least recently used first
+        self.buckets = {}  # Price bucket or grid cell -> keys of the entries filed under it
+        self.wide = set()  # Keys of entries reaching too many buckets, checked on every invalidation
+        self.targets = {}  # property_id -> keys of nearest-n entries around that property
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        if entry[1] is not None and entry[1] <= self.clock():
+            self._discard(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, scope):
+        if key in self.entries:
+            self._discard(key)
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        buckets = scope.buckets()
+        self.entries[key] = (value, expires_at, scope, buckets)
+        if buckets is None:
+            self.wide.add(key)
+        else:
+            for bucket in buckets:
+                self.buckets.setdefault(bucket, set()).add(key)
+        if isinstance(scope, GeoScope) and scope.target_id is not None:
+            self.targets.setdefault(scope.target_id, set()).add(key)
+        while len(self.entries) > self.maxsize:
+            self._discard(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _discard(self, key):
+        _, _, scope, buckets = self.entries.pop(key)
+        if buckets is None:
+            self.wide.discard(key)
+        else:
+            for bucket in buckets:
+                _remove(self.buckets, bucket, key)
+        if isinstance(scope, GeoScope) and scope.target_id is not None:
+            _remove(self.targets, scope.target_id, key)
+
+    def invalidate_property(self, property):
+        # Drop only the entries whose result could change when this property is added or removed, checking just
+        # those filed under its price bucket, its grid cell or its id
+        candidates = set(self.wide)
+        candidates.update(self.buckets.get(_price_bucket(property.property_type, property.price), ()))
+        candidates.update(self.buckets.get(_geo_cell(property.latitude, property.longitude), ()))
+        candidates.update(self.targets.get(property.property_id, ()))
+        for key in candidates:
+            if self.entries[key][2].affected_by(property):
+                self._discard(key)
+                self.invalidations += 1
+
+    def clear(self):
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.buckets.clear()
+        self.wide.clear()
+        self.targets.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def _remove(index, bucket, key):
+    keys = index[bucket]
+    keys.discard(key)
+    if not keys:
+        del index[bucket]
+
+
+class SynchronizedRecommendationCache(RecommendationCache):
+    # For thread-safe systems, where concurrent readers record hits and insert entries while holding only a read lock
+    def __init__(self, maxsize=10000, ttl=300.0, clock=time.monotonic):
+        super().__init__(maxsize, ttl, clock)
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            return super().get(key)
+
+    def put(self, key, value, scope):
+        with self.lock:
+            super().put(key, value, scope)
+
+    def invalidate_property(self, property):
+        with self.lock:
+            super().invalidate_property(property)
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+
+    def stats(self):
+        with self.lock:
+            return super().stats()
@@ -0,0 +1,108 @@
+import inspect
+from DataStructures.ReadWriteLock import ReadWriteLock
+
+# Collections guarded by their own reader-writer lock, in the order locks are taken so that methods needing
+# several of them never deadlock
+COLLECTIONS = ('properties', 'clients', 'agents', 'appointments', 'bids')
+
+# Method -> (collections it reads, collections it writes). A collection's lock covers all of its indexes, e.g.
+# 'properties' covers the property tree, hash index, geo grid, price tree, amenity postings and the listings queue.
+# Methods left out take no lock of their own: they are pure, or only call locked methods (ingestFeed batches
+# through setProperty/setClients, so readers get in between batches)
+METHOD_LOCKS = {
+    'getProperty': (('properties',), ()),
+    'getNearestNProperties': (('properties',), ()),
+    'getNearestNPropertiesToLocation': (('properties',), ()),
+    'getPropertiesWithinRadius': (('properties',), ()),
+    'getPropertiesInBounds': (('properties',), ()),
+    'getAllProperties': (('properties',), ()),
+    'filterProperties': (('properties',), ()),
+    'screenProperties': (('properties',), ()),
+    'nearestNeighborhood': (('properties',), ()),
+    'recommendProperties': (('properties',), ()),
+    'addProperty': ((), ('properties',)),
+    'deleteProperty': ((), ('properties',)),
+    'setProperty': ((), ('properties',)),
+    'changePropertyStatus': ((), ('properties',)),
+    'watchNewListings': ((), ('properties',)),
+    'getListingMatches': (('clients',), ('properties',)),  # Dequeues listings, matches them against clients
+    'recommendAllClients': (('properties', 'clients'), ()),
+    'getClient': (('clients',), ()),
+    'addClient': ((), ('clients',)),
+    'setClients': ((), ('clients',)),
+    'deleteClient': ((), ('clients',)),
+    'updateClientRequirement': ((), ('clients',)),
+    'getAgent': (('agents',), ()),
+    'addAgent': ((), ('agents',)),
+    'getNextFreeSlot': (('appointments',), ()),
+    'scheduleAppointment': ((), ('appointments',)),
+    'getFirstAppointment': ((), ('appointments',)),
+    'cancelAppointment': ((), ('appointments',)),
+    'getHighestBid': (('bids',), ()),
+    'getTopBids': (('bids',), ()),
+    'getClientBids': (('bids',), ()),
+    'placeBid': ((), ('bids',)),
+    'placeBidIfHighest': ((), ('bids',)),  # Checks the best bid and places under one write lock
+    'withdrawBid': ((), ('bids',)),
+    'startRealTimeBidding': ((), ('bids',)),
+    'getInventorySnapshot': (('properties', 'clients', 'agents'), ()),  # One consistent version of all three
+    '_publishProperties': ((), ('properties',)),  # reloadProperties builds without the lock, then swaps under it
+    'saveSnapshot': (COLLECTIONS, ()),
+    'compactLog': ((), COLLECTIONS),  # No mutation may land between the snapshot and the log truncation
+    'closeLog': ((), COLLECTIONS),  # No mutation may append to the log while it is committed and closed
+}
+
+
+class ThreadSafety:
+    # Wraps the system's methods on the instance so each call holds the locks of the collections it touches; a
+    # system created without thread_safe runs the plain class methods
+    def __init__(self, system):
+        self.system = system
+        self.locks = {name: ReadWriteLock() for name in COLLECTIONS}
+
+    def install(self):
+        for name, (reads, writes) in METHOD_LOCKS.items():
+            steps = [(self.locks[collection], collection in writes) for collection in COLLECTIONS
+                     if collection in reads or collection in writes]
+            setattr(self.system, name, _locked(getattr(self.system, name), steps))
+
+
+def _acquire(steps):
+    for index, (lock, write) in enumerate(steps):
+        try:
+            lock.acquire_write() if write else lock.acquire_read()
+        except BaseException:
+            _release(steps[:index])
+            raise
+
+
+def _release(steps):
+    for lock, write in reversed(steps):
+        lock.release_write() if write else lock.release_read()
+
+
+def _locked(method, steps):
+    def locked(*args, **kwargs):
+        _acquire(steps)
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            _release(steps)
+        if inspect.isgenerator(result):
+            return _locked_iteration(result, steps)
+        return result
+    locked.__wrapped__ = method
+    return locked
+
+
+def _locked_iteration(generator, steps):
+    # Lazy results hold the locks while producing each item, not while the caller works on it
+    while True:
+        _acquire(steps)
+        try:
+            item = next(generator)
+        except StopIteration:
+            return
+        finally:
+            _release(steps)
+        yield item